@@ -2,23 +2,617 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+import plotly.io as pio
+from datetime import datetime, timedelta, timezone
 import numpy as np
-from src.data_collector import RedditDataCollector
-from src.sentiment_analyzer import SentimentAnalyzer
+import re
+import os
+import io
+import json
+import logging
+from src.config import DATA_CONFIG
+from src.data_collector import RedditDataCollector, STRING_COLUMNS
+from src.sentiment_analyzer import SENTIMENT_LABELS
 from src.data_processor import RedditDataProcessor
 import time
-import altair as alt
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-import seaborn as sns
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+# Shared chart theme: plotly_dark with transparent backgrounds so figures
+# sit on the dashboard's own cards, plus the font, title size and grid
+# colour from app.utils.create_custom_theme
+pio.templates['reddit_dark'] = go.layout.Template(
+    layout=dict(
+        font=dict(family='Arial, sans-serif'),
+        title_font_size=24,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor='#eee'),
+        yaxis=dict(gridcolor='#eee')
+    )
+)
+pio.templates.default = 'plotly_dark+reddit_dark'
+
+_CSS = """
+<style>
+/* Modern Theme */
+:root {
+    --primary-color: #ff4b4b;
+    --secondary-color: #1e88e5;
+    --background-dark: #0e1117;
+    --card-dark: #1e1e2e;
+    --text-color: #ffffff;
+}
+
+/* Header Styling */
+.dashboard-header {
+    padding: 1rem;
+    margin-bottom: 2rem;
+    text-align: center;
+    background: linear-gradient(90deg, #ff4b4b 0%, #ff8f8f 100%);
+    border-radius: 10px;
+    color: white;
+}
+
+/* Metric Cards */
+.metric-container {
+    background-color: var(--card-dark);
+    border-radius: 15px;
+    padding: 20px;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    transition: transform 0.2s ease;
+}
+
+.metric-container:hover {
+    transform: translateY(-5px);
+}
+
+/* Charts */
+.chart-container {
+    background-color: var(--card-dark);
+    border-radius: 15px;
+    padding: 20px;
+    margin: 10px 0;
+}
+
+/* Custom Tabs */
+.stTabs [data-baseweb="tab-list"] {
+    gap: 8px;
+    background-color: var(--card-dark);
+    padding: 10px;
+    border-radius: 10px;
+}
+
+.stTabs [data-baseweb="tab"] {
+    height: 50px;
+    background-color: transparent;
+    border: none;
+    color: white;
+    border-radius: 5px;
+    padding: 10px 20px;
+}
+
+.stTabs [data-baseweb="tab"]:hover {
+    background-color: rgba(255, 75, 75, 0.1);
+}
+
+.stTabs [data-baseweb="tab"][aria-selected="true"] {
+    background-color: var(--primary-color);
+}
+
+/* Sidebar */
+.css-1d391kg {
+    background-color: var(--card-dark);
+}
+
+/* Inputs */
+.stTextInput input,
+.stSelectbox select,
+.stTextArea textarea {
+    background-color: #1e1e2e;
+    border-color: #363654;
+    color: white;
+    border-radius: 8px;
+}
+
+/* Buttons */
+.stButton>button {
+    background: linear-gradient(90deg, #ff4b4b 0%, #ff8f8f 100%);
+    color: white;
+    border: none;
+    padding: 12px 24px;
+    border-radius: 8px;
+    font-weight: 600;
+    transition: all 0.3s ease;
+}
+
+.stButton>button:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 12px rgba(255, 75, 75, 0.2);
+}
+
+/* Progress Bar */
+.stProgress > div > div > div > div {
+    background-color: var(--primary-color);
+}
+
+/* Expander */
+.streamlit-expanderHeader {
+    background-color: var(--card-dark);
+    border-radius: 8px;
+}
+
+/* Custom Scrollbar */
+::-webkit-scrollbar {
+    width: 10px;
+    height: 10px;
+}
+
+::-webkit-scrollbar-track {
+    background: var(--background-dark);
+}
+
+::-webkit-scrollbar-thumb {
+    background: #888;
+    border-radius: 5px;
+}
+
+::-webkit-scrollbar-thumb:hover {
+    background: #555;
+}
+
+/* Loading Animation */
+.loading-spinner {
+    display: flex;
+    justify-content: center;
+    align-items: center;
+    height: 100px;
+}
+
+@keyframes pulse {
+    0% { transform: scale(1); }
+    50% { transform: scale(1.1); }
+    100% { transform: scale(1); }
+}
+
+.pulse {
+    animation: pulse 2s infinite;
+}
+</style>
+"""
+
+_CHART_HEADER = '<div class="chart-container"><h3>{}</h3></div>'
+
+_CARD_GRID = (
+    '<div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 16px;">'
+    '{}'
+    '</div>'
+)
+
+_SUMMARY_CARD = (
+    '<div class="metric-container">'
+    '<div style="font-size: 24px; margin-bottom: 8px;">{icon} {title}</div>'
+    '<div style="font-size: 32px; font-weight: bold; color: var(--primary-color);">'
+    '{value}</div>'
+    '<div style="font-size: 14px; color: #666;">{delta}</div>'
+    '</div>'
+)
+
+_TOPIC_CARD = (
+    '<div class="metric-container">'
+    '<h3>{title}</h3>'
+    '<div style="font-size: 32px; font-weight: bold; color: var(--primary-color);">'
+    '{value}</div>'
+    '<div style="font-size: 14px; color: #666;">{delta}</div>'
+    '</div>'
+)
+
+_CARD_ROW = (
+    '<div style="display: flex; gap: 16px;">'
+    '{}'
+    '</div>'
+)
+
+_SUBREDDIT_STAT = (
+    '<div style="margin: 15px 0;">'
+    '<div style="font-size: 14px; color: #666;">{label}</div>'
+    '<div style="font-size: 24px; color: var(--primary-color);">{value}</div>'
+    '</div>'
+)
+
+_SUBREDDIT_CARD = (
+    '<div class="metric-container" style="flex: 1;">'
+    '<h3>r/{subreddit}</h3>'
+    + _SUBREDDIT_STAT.format(label='Posts', value='{total_posts}')
+    + _SUBREDDIT_STAT.format(label='Avg Score', value='{avg_score}')
+    + _SUBREDDIT_STAT.format(label='Comments', value='{total_comments}')
+    + _SUBREDDIT_STAT.format(label='Positive Sentiment', value='{positive_ratio}%')
+    + '</div>'
+)
+
+_POST_DETAILS = (
+    '<details style="margin: 10px 0;">'
+    '<summary>📊 Top Posts from r/{subreddit}</summary>'
+    '{posts}'
+    '</details>'
+)
+
+_POST_CARD = (
+    '<div class="metric-container" style="margin-top: 10px;">'
+    '<h4>{title}</h4>'
+    '<div style="display: flex; justify-content: space-between; margin: 10px 0;">'
+    '<span>Score: {score}</span>'
+    '<span>Comments: {num_comments}</span>'
+    '<span>Sentiment: {sentiment}</span>'
+    '</div>'
+    '<div style="color: #666;">{text}</div>'
+    '</div>'
+)
+
+_LOADING_SPINNER = """
+    <div class="loading-spinner">
+        <div class="pulse">🔄</div>
+    </div>
+"""
+
+# Upper bound on word cloud input; plenty for a 100-word cloud
+_WORDCLOUD_MAX_CHARS = 200_000
+
+# Most points a single time-series trace sends to the browser
+_MAX_TRACE_POINTS = 1000
+
+# Sidebar settings read once per run, with fallbacks for unset widgets
+_PARAM_DEFAULTS = {
+    'subreddit': 'wallstreetbets',
+    'post_limit': 100,
+    'topics': '',
+    'subreddits': '',
+    'time_filter': 'day'
+}
+
+
+def _minmax_indices(values, n_out=_MAX_TRACE_POINTS):
+    """
+    Select indices that preserve the shape of a long series.
+
+    The series is split into equal buckets and the minimum and maximum of
+    each bucket are kept, along with both endpoints, so peaks survive while
+    the trace stays under n_out points.
+
+    Args:
+        values: 1-D array of y values in x order
+        n_out: Maximum number of points to keep
+
+    Returns:
+        Sorted array of indices into values
+    """
+    n = len(values)
+    if n <= n_out:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, (n_out - 2) // 2 + 1).astype(int)
+    indices = [0, n - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            bucket = values[lo:hi]
+            indices.extend((lo + bucket.argmin(), lo + bucket.argmax()))
+    return np.unique(indices)
+
+def _topic_masks(combined_lc, topics):
+    """
+    Flag the posts that mention each topic.
+
+    Each topic is matched separately, so overlapping topics such as 'ai'
+    and 'openai' each count a post that contains both.
+
+    Args:
+        combined_lc: Series of lowercased title and text per post
+        topics: Topics to look for
+
+    Returns:
+        Dict of lowercased topic to boolean array over combined_lc
+    """
+    return {
+        topic: combined_lc.str.contains(
+            re.escape(topic), regex=True, na=False
+        ).to_numpy()
+        for topic in dict.fromkeys(topic.lower() for topic in topics)
+    }
+
+# Columns holding Python lists, which parquet hands back as numpy arrays
+_LIST_COLUMNS = ('mentions', 'tickers')
+
+def _disk_cache_path(subreddit, post_limit, time_filter):
+    """Build the on-disk cache path for a subreddit query."""
+    safe_name = re.sub(r'\W', '_', subreddit)
+    return os.path.join(
+        DATA_CONFIG['cache_dir'],
+        f"{safe_name}_{post_limit}_{time_filter}.parquet"
+    )
+
+def _json_default(value):
+    """Convert numpy scalars in the insights dictionary to plain Python."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _load_disk_cache(path):
+    """
+    Load processed results from disk if present and younger than the TTL.
+
+    Returns:
+        Tuple of processed DataFrame and insights dictionary, or None
+    """
+    try:
+        if not os.path.exists(path) or not os.path.exists(path + '.json'):
+            return None
+        if time.time() - os.path.getmtime(path) >= DATA_CONFIG['disk_cache_ttl']:
+            return None
+        with open(path + '.json') as f:
+            insights = json.load(f)
+        # Parquet metadata only records "string", so restore the Arrow backend
+        processed_df = pd.read_parquet(path).astype(
+            {column: 'string[pyarrow]' for column in STRING_COLUMNS}
+        )
+        for column in _LIST_COLUMNS:
+            if column in processed_df.columns:
+                processed_df[column] = [
+                    list(value) if value is not None else value
+                    for value in processed_df[column]
+                ]
+        return processed_df, insights
+    except Exception as e:
+        logger.error(f"Error reading disk cache {path}: {str(e)}")
+        return None
+
+def _clear_disk_cache():
+    """Remove every persisted subreddit result from the disk cache."""
+    try:
+        cache_dir = DATA_CONFIG['cache_dir']
+        if not os.path.isdir(cache_dir):
+            return
+        for name in os.listdir(cache_dir):
+            if name.endswith(('.parquet', '.parquet.json', '.tmp')):
+                os.remove(os.path.join(cache_dir, name))
+    except Exception as e:
+        logger.error(f"Error clearing disk cache: {str(e)}")
+
+def _save_disk_cache(path, processed_df, insights):
+    """
+    Persist processed results so they survive a server restart.
+
+    Both files are written under temporary names and moved into place,
+    parquet last, so concurrent writers never leave a partial file and
+    the loader's age check on the parquet covers a complete pair.
+    """
+    tmp_suffix = f'.{uuid.uuid4().hex}.tmp'
+    tmp_json, tmp_parquet = path + '.json' + tmp_suffix, path + tmp_suffix
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_json, 'w') as f:
+            json.dump(insights, f, default=_json_default)
+        processed_df.to_parquet(tmp_parquet)
+        os.replace(tmp_json, path + '.json')
+        os.replace(tmp_parquet, path)
+    except Exception as e:
+        logger.error(f"Error writing disk cache {path}: {str(e)}")
+        for tmp_path in (tmp_json, tmp_parquet):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+@st.cache_data(ttl=DATA_CONFIG['cache_duration'], show_spinner=False)
+def _fetch_and_process(_collector, _processor, subreddit, post_limit, time_filter):
+    """
+    Fetch and process subreddit posts, memoized across Streamlit reruns.
+
+    The collector and processor are excluded from the cache key (leading
+    underscore), so results are keyed on (subreddit, post_limit, time_filter).
+    Below the in-memory cache sits a parquet copy on disk, so a restarted
+    server can skip the Reddit fetch and sentiment scoring.
+
+    Returns:
+        Tuple of processed DataFrame and insights dictionary
+    """
+    path = _disk_cache_path(subreddit, post_limit, time_filter)
+    cached = _load_disk_cache(path)
+    if cached is not None:
+        return cached
+
+    df = _collector.fetch_subreddit_data(subreddit, post_limit, time_filter)
+    processed_df, insights = _processor.process_reddit_data(df)
+    _save_disk_cache(path, processed_df, insights)
+    return processed_df, insights
+
+@st.cache_data(show_spinner=False)
+def _export_csv(df):
+    """Serialize a DataFrame to CSV bytes for download."""
+    return df.to_csv(index=False).encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def _export_parquet(df):
+    """Serialize a DataFrame to Parquet bytes for download."""
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def _build_wordcloud(text):
+    """Render the topic word cloud to an image, memoized on the input text."""
+    # Imported lazily: only the trending topics view draws a word cloud
+    from wordcloud import WordCloud, STOPWORDS
+
+    return WordCloud(
+        width=800,
+        height=400,
+        background_color='#1e1e2e',
+        colormap='viridis',
+        max_words=100,
+        stopwords=frozenset(STOPWORDS),
+        collocations=False
+    ).generate(text).to_image()
+
+@st.cache_data(show_spinner=False)
+def _sentiment_pie(sentiment_scores):
+    """Build the sentiment distribution pie from per-sentiment score totals."""
+    fig = px.pie(
+        sentiment_scores,
+        names='sentiment',
+        values='score',
+        color='sentiment',
+        color_discrete_map={
+            'positive': '#28a745',
+            'negative': '#dc3545',
+            'neutral': '#6c757d'
+        },
+        hole=0.4
+    )
+    
+    fig.update_layout(
+        title=None
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _hourly_sentiment_chart(counts):
+    """Build the posts-per-hour line chart from a 24 x sentiment count matrix."""
+    fig = go.Figure()
+    
+    for code, sentiment in enumerate(SENTIMENT_LABELS):
+        if not counts[:, code].any():
+            continue
+        fig.add_trace(go.Scatter(
+            x=np.arange(24),
+            y=counts[:, code],
+            name=sentiment,
+            mode='lines+markers',
+            line=dict(width=3)
+        ))
+    
+    fig.update_layout(
+        xaxis_title="Hour of Day",
+        yaxis_title="Number of Posts"
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _trending_topics_chart(topics, counts):
+    """Build the trending topics bar chart from topic names and counts."""
+    fig = go.Figure(go.Bar(
+        x=topics,
+        y=counts,
+        marker=dict(
+            color=counts,
+            colorscale='Viridis',
+            colorbar=dict(title='count')
+        )
+    ))
+    
+    fig.update_layout(
+        xaxis_title='topic',
+        yaxis_title='count'
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _topic_engagement_chart(topic_df):
+    """Build the dual-axis mentions / average score bar chart per topic."""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        name='Mentions',
+        x=topic_df['topic'],
+        y=topic_df['mentions'],
+        marker_color='#ff4b4b'
+    ))
+    
+    fig.add_trace(go.Bar(
+        name='Avg Score',
+        x=topic_df['topic'],
+        y=topic_df['avg_score'],
+        marker_color='#1e88e5',
+        yaxis='y2'
+    ))
+    
+    fig.update_layout(
+        barmode='group',
+        yaxis2=dict(
+            overlaying='y',
+            side='right'
+        )
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _topic_sentiment_chart(topic_df):
+    """Build the topic mentions vs. sentiment bubble chart."""
+    fig = px.scatter(
+        topic_df,
+        x='mentions',
+        y='avg_sentiment_score',
+        size='avg_score',
+        color='positive_ratio',
+        text='topic',
+        color_continuous_scale='RdYlGn',
+        hover_data=['total_comments']
+    )
+    
+    fig.update_traces(
+        textposition='top center',
+        marker=dict(sizeref=2.*max(topic_df['avg_score'])/100**2)
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _sentiment_distribution_chart(df):
+    """Build the grouped sentiment histogram for the compared subreddits."""
+    fig = px.histogram(
+        df,
+        x='sentiment',
+        color='subreddit',
+        barmode='group',
+        title=None
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _subreddit_box_chart(df, column, subreddit_order):
+    """Build a per-subreddit box plot of one numeric column."""
+    fig = px.box(
+        df,
+        x='subreddit',
+        y=column,
+        color='subreddit',
+        points='outliers',
+        category_orders={'subreddit': subreddit_order}
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _hourly_activity_chart(df):
+    """Build the posts-per-hour line chart from a cross tabulation per subreddit."""
+    activity_df = (
+        pd.crosstab(df['hour_of_day'].rename('hour'), df['subreddit'])
+        .melt(ignore_index=False, value_name='posts')
+        .reset_index()
+    )
+    fig = px.line(
+        activity_df,
+        x='hour',
+        y='posts',
+        color='subreddit'
+    )
+    return fig.to_dict()
 
 class ModernRedditDashboard:
     def __init__(self):
         self.setup_page_config()
         self.reddit_collector = RedditDataCollector()
-        self.sentiment_analyzer = SentimentAnalyzer()
         self.data_processor = RedditDataProcessor()
+        self.sentiment_analyzer = self.data_processor.sentiment_analyzer
 
     def setup_page_config(self):
         """Configure the page with modern styling."""
@@ -30,153 +624,7 @@ class ModernRedditDashboard:
         )
 
         # Apply custom CSS
-        st.markdown("""
-        <style>
-        /* Modern Theme */
-        :root {
-            --primary-color: #ff4b4b;
-            --secondary-color: #1e88e5;
-            --background-dark: #0e1117;
-            --card-dark: #1e1e2e;
-            --text-color: #ffffff;
-        }
-        
-        /* Header Styling */
-        .dashboard-header {
-            padding: 1rem;
-            margin-bottom: 2rem;
-            text-align: center;
-            background: linear-gradient(90deg, #ff4b4b 0%, #ff8f8f 100%);
-            border-radius: 10px;
-            color: white;
-        }
-        
-        /* Metric Cards */
-        .metric-container {
-            background-color: var(--card-dark);
-            border-radius: 15px;
-            padding: 20px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            transition: transform 0.2s ease;
-        }
-        
-        .metric-container:hover {
-            transform: translateY(-5px);
-        }
-        
-        /* Charts */
-        .chart-container {
-            background-color: var(--card-dark);
-            border-radius: 15px;
-            padding: 20px;
-            margin: 10px 0;
-        }
-        
-        /* Custom Tabs */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 8px;
-            background-color: var(--card-dark);
-            padding: 10px;
-            border-radius: 10px;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            height: 50px;
-            background-color: transparent;
-            border: none;
-            color: white;
-            border-radius: 5px;
-            padding: 10px 20px;
-        }
-        
-        .stTabs [data-baseweb="tab"]:hover {
-            background-color: rgba(255, 75, 75, 0.1);
-        }
-        
-        .stTabs [data-baseweb="tab"][aria-selected="true"] {
-            background-color: var(--primary-color);
-        }
-        
-        /* Sidebar */
-        .css-1d391kg {
-            background-color: var(--card-dark);
-        }
-        
-        /* Inputs */
-        .stTextInput input,
-        .stSelectbox select,
-        .stTextArea textarea {
-            background-color: #1e1e2e;
-            border-color: #363654;
-            color: white;
-            border-radius: 8px;
-        }
-        
-        /* Buttons */
-        .stButton>button {
-            background: linear-gradient(90deg, #ff4b4b 0%, #ff8f8f 100%);
-            color: white;
-            border: none;
-            padding: 12px 24px;
-            border-radius: 8px;
-            font-weight: 600;
-            transition: all 0.3s ease;
-        }
-        
-        .stButton>button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(255, 75, 75, 0.2);
-        }
-        
-        /* Progress Bar */
-        .stProgress > div > div > div > div {
-            background-color: var(--primary-color);
-        }
-        
-        /* Expander */
-        .streamlit-expanderHeader {
-            background-color: var(--card-dark);
-            border-radius: 8px;
-        }
-        
-        /* Custom Scrollbar */
-        ::-webkit-scrollbar {
-            width: 10px;
-            height: 10px;
-        }
-        
-        ::-webkit-scrollbar-track {
-            background: var(--background-dark);
-        }
-        
-        ::-webkit-scrollbar-thumb {
-            background: #888;
-            border-radius: 5px;
-        }
-        
-        ::-webkit-scrollbar-thumb:hover {
-            background: #555;
-        }
-        
-        /* Loading Animation */
-        .loading-spinner {
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            height: 100px;
-        }
-        
-        @keyframes pulse {
-            0% { transform: scale(1); }
-            50% { transform: scale(1.1); }
-            100% { transform: scale(1); }
-        }
-        
-        .pulse {
-            animation: pulse 2s infinite;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(_CSS, unsafe_allow_html=True)
 
     def run(self):
         """Main dashboard execution."""
@@ -195,12 +643,18 @@ class ModernRedditDashboard:
         try:
             analysis_type = st.session_state.get('analysis_type', 'General Analysis')
             
+            # Snapshot the sidebar settings once for the render path
+            params = {
+                key: st.session_state.get(key, default)
+                for key, default in _PARAM_DEFAULTS.items()
+            }
+            
             if analysis_type == "General Analysis":
-                self.show_general_analysis()
+                self.show_general_analysis(params)
             elif analysis_type == "Topic Tracking":
-                self.show_topic_analysis()
+                self.show_topic_analysis(params)
             else:
-                self.show_comparative_analysis()
+                self.show_comparative_analysis(params)
                 
         except Exception as e:
             self.show_error_message(str(e))
@@ -271,32 +725,36 @@ class ModernRedditDashboard:
                 st.session_state['last_refresh'] = datetime.now()
                 st.experimental_rerun()
             
+            # Drop memoized and persisted results so the next run refetches
+            if st.button("🧹 Clear Cache", use_container_width=True):
+                st.cache_data.clear()
+                _clear_disk_cache()
+                st.success("Cache cleared")
+            
             # Last update time
             if 'last_refresh' in st.session_state:
                 st.markdown(
                     f"*Last updated: {st.session_state['last_refresh'].strftime('%H:%M:%S')}*"
                 )
                 
-    def show_general_analysis(self):
+    def show_general_analysis(self, params):
         """Display general subreddit analysis with modern visualizations."""
         try:
-            subreddit = st.session_state.get('subreddit', 'wallstreetbets')
+            subreddit = params['subreddit']
             
             # Loading animation
             with st.spinner(f"Analyzing r/{subreddit}..."):
                 placeholder = st.empty()
-                placeholder.markdown("""
-                    <div class="loading-spinner">
-                        <div class="pulse">🔄</div>
-                    </div>
-                """, unsafe_allow_html=True)
+                placeholder.markdown(_LOADING_SPINNER, unsafe_allow_html=True)
                 
                 # Fetch and process data
-                df = self.reddit_collector.fetch_subreddit_data(
+                processed_df, insights = _fetch_and_process(
+                    self.reddit_collector,
+                    self.data_processor,
                     subreddit,
-                    st.session_state.get('post_limit', 100)
+                    params['post_limit'],
+                    params['time_filter']
                 )
-                processed_df, insights = self.data_processor.process_reddit_data(df)
                 placeholder.empty()
                 
                 # Summary metrics
@@ -321,16 +779,45 @@ class ModernRedditDashboard:
                 
                 with tab_posts:
                     self.show_top_posts(processed_df)
+                
+                self.show_download_buttons(processed_df, subreddit)
                     
         except Exception as e:
             st.error(f"Error in analysis: {str(e)}")
     
+    def show_download_buttons(self, df, name):
+        """Offer the processed posts as CSV and Parquet downloads."""
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.download_button(
+                "⬇️ Download CSV",
+                data=_export_csv(df),
+                file_name=f"{name}_posts.csv",
+                mime='text/csv',
+                use_container_width=True
+            )
+        
+        with col2:
+            st.download_button(
+                "⬇️ Download Parquet",
+                data=_export_parquet(df),
+                file_name=f"{name}_posts.parquet",
+                mime='application/octet-stream',
+                use_container_width=True
+            )
+    
     def show_summary_metrics(self, df, insights):
         """Display modern summary metrics."""
         total_posts = len(df)
-        recent_posts = len(df[df['created_utc'] > datetime.now() - timedelta(hours=24)])
+        # created_utc is naive UTC, so compare against a naive UTC cutoff
+        cutoff = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=24))
+        recent_posts = int((df['created_utc'].to_numpy() > cutoff).sum())
+        sent_mean = df['sentiment_score'].mean()
+        score_mean = df['score'].mean()
+        cmt_sum = df['num_comments'].sum()
+        cmt_mean = df['num_comments'].mean()
         
-        cols = st.columns(4)
         metrics = [
             {
                 "title": "Total Posts",
@@ -340,171 +827,101 @@ class ModernRedditDashboard:
             },
             {
                 "title": "Avg Sentiment",
-                "value": f"{df['sentiment_score'].mean():.2f}",
+                "value": f"{sent_mean:.2f}",
                 "delta": "sentiment score",
                 "icon": "😊"
             },
             {
                 "title": "Engagement Rate",
-                "value": f"{df['score'].mean():,.0f}",
+                "value": f"{score_mean:,.0f}",
                 "delta": "per post",
                 "icon": "⭐"
             },
             {
                 "title": "Total Comments",
-                "value": f"{df['num_comments'].sum():,}",
-                "delta": f"{df['num_comments'].mean():.1f} per post",
+                "value": f"{cmt_sum:,}",
+                "delta": f"{cmt_mean:.1f} per post",
                 "icon": "💬"
             }
         ]
         
-        for col, metric in zip(cols, metrics):
-            with col:
-                st.markdown(f"""
-                    <div class="metric-container">
-                        <div style="font-size: 24px; margin-bottom: 8px;">
-                            {metric['icon']} {metric['title']}
-                        </div>
-                        <div style="font-size: 32px; font-weight: bold; color: var(--primary-color);">
-                            {metric['value']}
-                        </div>
-                        <div style="font-size: 14px; color: #666;">
-                            {metric['delta']}
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
+        st.markdown(
+            _CARD_GRID.format(''.join(_SUMMARY_CARD.format(**m) for m in metrics)),
+            unsafe_allow_html=True
+        )
 
     def show_sentiment_analysis(self, df):
         """Display detailed sentiment analysis."""
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("""
-                <div class="chart-container">
-                    <h3>Sentiment Distribution</h3>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Sentiment pie chart
-            fig = px.pie(
-                df,
-                names='sentiment',
-                values='score',
-                color='sentiment',
-                color_discrete_map={
-                    'positive': '#28a745',
-                    'negative': '#dc3545',
-                    'neutral': '#6c757d'
-                },
-                hole=0.4
-            )
+            st.markdown(_CHART_HEADER.format('Sentiment Distribution'), unsafe_allow_html=True)
             
-            fig.update_layout(
-                template='plotly_dark',
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                title=None
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            # Sentiment pie chart over per-sentiment score totals
+            sent_code = df['sentiment'].cat.codes.to_numpy()
+            known = sent_code >= 0
+            sentiment_scores = pd.DataFrame({
+                'sentiment': SENTIMENT_LABELS,
+                'score': np.bincount(
+                    sent_code[known],
+                    weights=df['score'].to_numpy()[known],
+                    minlength=len(SENTIMENT_LABELS)
+                )
+            })
+            st.plotly_chart(go.Figure(_sentiment_pie(sentiment_scores)), use_container_width=True)
         
         with col2:
-            st.markdown("""
-                <div class="chart-container">
-                    <h3>Sentiment Over Time</h3>
-                </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_CHART_HEADER.format('Sentiment Over Time'), unsafe_allow_html=True)
             
-            # Time series analysis
-            df['hour'] = df['created_utc'].dt.hour
-            hourly_sentiment = df.groupby(['hour', 'sentiment']).size().unstack()
+            # Time series analysis: dense 24 x 3 hour/sentiment histogram
+            hour = df['created_utc'].dt.hour.to_numpy()
+            sent_code = df['sentiment'].cat.codes.to_numpy()
+            known = sent_code >= 0
+            counts = np.zeros((24, len(SENTIMENT_LABELS)), dtype=np.int64)
+            np.add.at(counts, (hour[known], sent_code[known]), 1)
             
-            fig = go.Figure()
-            
-            for sentiment in hourly_sentiment.columns:
-                fig.add_trace(go.Scatter(
-                    x=hourly_sentiment.index,
-                    y=hourly_sentiment[sentiment],
-                    name=sentiment,
-                    mode='lines+markers',
-                    line=dict(width=3)
-                ))
-            
-            fig.update_layout(
-                template='plotly_dark',
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                xaxis_title="Hour of Day",
-                yaxis_title="Number of Posts"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(go.Figure(_hourly_sentiment_chart(counts)), use_container_width=True)
 
     def show_trending_topics(self, insights, df):
         """Display trending topics analysis."""
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("""
-                <div class="chart-container">
-                    <h3>Topic Cloud</h3>
-                </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_CHART_HEADER.format('Topic Cloud'), unsafe_allow_html=True)
             
             # Generate word cloud
-            text = ' '.join(df['title'] + ' ' + df['text'])
-            wordcloud = WordCloud(
-                width=800,
-                height=400,
-                background_color='#1e1e2e',
-                colormap='viridis',
-                max_words=100
-            ).generate(text)
-            
-            fig, ax = plt.subplots(figsize=(10,5))
-            ax.imshow(wordcloud, interpolation='bilinear')
-            ax.axis('off')
-            ax.set_facecolor('#1e1e2e')
-            fig.patch.set_facecolor('#1e1e2e')
-            
-            st.pyplot(fig)
+            text = (
+                df['title'].fillna('')
+                .str.cat(df['text'].fillna(''), sep=' ')
+                .str.cat(sep=' ')
+            )[:_WORDCLOUD_MAX_CHARS]
+            st.image(_build_wordcloud(text), use_container_width=True)
         
         with col2:
-            st.markdown("""
-                <div class="chart-container">
-                    <h3>Top Trending Topics</h3>
-                </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_CHART_HEADER.format('Top Trending Topics'), unsafe_allow_html=True)
             
             if insights['trending_topics']:
-                topics_df = pd.DataFrame(insights['trending_topics'])
-                fig = px.bar(
-                    topics_df.head(10),
-                    x='topic',
-                    y='count',
-                    color='count',
-                    color_continuous_scale='viridis'
-                )
-                
-                fig.update_layout(
-                    template='plotly_dark',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)'
+                # Topics arrive sorted by count, so the top ten is a slice
+                top_topics = insights['trending_topics'][:10]
+                st.plotly_chart(
+                    go.Figure(_trending_topics_chart(
+                        [t['topic'] for t in top_topics],
+                        [t['count'] for t in top_topics]
+                    )),
+                    use_container_width=True
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
-                
-    def show_topic_analysis(self):
+    def show_topic_analysis(self, params):
         """Display topic-specific analysis with modern visualizations."""
         try:
-            # Get inputs from session state
-            subreddit = st.session_state.get('subreddit', 'all')
+            # Get inputs from the settings snapshot
+            subreddit = params['subreddit']
             topics = [
                 topic.strip() 
-                for topic in st.session_state.get('topics', '').split('\n') 
+                for topic in params['topics'].split('\n') 
                 if topic.strip()
             ]
-            post_limit = st.session_state.get('post_limit', 100)
+            post_limit = params['post_limit']
             
             if not topics:
                 st.warning("Please enter at least one topic to track")
@@ -513,227 +930,169 @@ class ModernRedditDashboard:
             # Loading animation
             with st.spinner(f"Analyzing topics in r/{subreddit}..."):
                 placeholder = st.empty()
-                placeholder.markdown("""
-                    <div class="loading-spinner">
-                        <div class="pulse">🔄</div>
-                    </div>
-                """, unsafe_allow_html=True)
+                placeholder.markdown(_LOADING_SPINNER, unsafe_allow_html=True)
                 
                 # Fetch data
-                df = self.reddit_collector.fetch_subreddit_data(subreddit, post_limit)
-                processed_df, _ = self.data_processor.process_reddit_data(df)
+                processed_df, _ = _fetch_and_process(
+                    self.reddit_collector,
+                    self.data_processor,
+                    subreddit,
+                    post_limit,
+                    params['time_filter']
+                )
                 placeholder.empty()
                 
-                # Topic analysis
-                topic_data = []
-                for topic in topics:
-                    topic = topic.lower()
-                    # Search in both title and text
-                    topic_mask = (
-                        processed_df['title'].str.lower().str.contains(topic, na=False) |
-                        processed_df['text'].str.lower().str.contains(topic, na=False)
+                # Lowercase title and text once and match each topic
+                # against the combined column
+                processed_df['_title_lc'] = processed_df['title'].str.lower()
+                processed_df['_text_lc'] = processed_df['text'].fillna('').str.lower()
+                processed_df['_combined_lc'] = (
+                    processed_df['_title_lc'] + ' ' + processed_df['_text_lc']
+                )
+                topic_masks = _topic_masks(processed_df['_combined_lc'], topics)
+                
+                # Topic analysis: one long-form (post, topic) frame and a
+                # single groupby computes every per-topic metric
+                topic_hits = pd.DataFrame({
+                    'post': processed_df.index[
+                        np.concatenate([np.flatnonzero(m) for m in topic_masks.values()])
+                    ],
+                    'topic': np.repeat(
+                        list(topic_masks),
+                        [np.count_nonzero(m) for m in topic_masks.values()]
                     )
-                    topic_posts = processed_df[topic_mask]
-                    
-                    if not topic_posts.empty:
-                        topic_data.append({
-                            'topic': topic,
-                            'mentions': len(topic_posts),
-                            'avg_sentiment_score': topic_posts['sentiment_score'].mean(),
-                            'avg_score': topic_posts['score'].mean(),
-                            'total_comments': topic_posts['num_comments'].sum(),
-                            'positive_ratio': (topic_posts['sentiment'] == 'positive').mean()
-                        })
+                })
+                joined = topic_hits.join(
+                    processed_df[['sentiment_score', 'score', 'num_comments', 'sentiment']],
+                    on='post'
+                )
+                topic_df = (
+                    joined.assign(is_positive=joined['sentiment'] == 'positive')
+                    .groupby('topic', sort=False)
+                    .agg(
+                        mentions=('post', 'size'),
+                        avg_sentiment_score=('sentiment_score', 'mean'),
+                        avg_score=('score', 'mean'),
+                        total_comments=('num_comments', 'sum'),
+                        positive_ratio=('is_positive', 'mean')
+                    )
+                )
+                topic_df = topic_df.reindex(
+                    [topic for topic in topic_masks if topic in topic_df.index]
+                ).reset_index()
                 
-                if topic_data:
-                    # Create DataFrame for topics
-                    topic_df = pd.DataFrame(topic_data)
-                    
+                if not topic_df.empty:
                     # Summary metrics
-                    cols = st.columns(4)
-                    
-                    with cols[0]:
-                        st.markdown("""
-                            <div class="metric-container">
-                                <h3>📊 Topics Tracked</h3>
-                                <div style="font-size: 32px; font-weight: bold; color: var(--primary-color);">
-                                    {}</div>
-                                <div style="font-size: 14px; color: #666;">
-                                    {} with mentions</div>
-                            </div>
-                        """.format(len(topics), len(topic_data)), unsafe_allow_html=True)
-                    
-                    with cols[1]:
-                        st.markdown("""
-                            <div class="metric-container">
-                                <h3>🎯 Total Mentions</h3>
-                                <div style="font-size: 32px; font-weight: bold; color: var(--primary-color);">
-                                    {}</div>
-                                <div style="font-size: 14px; color: #666;">
-                                    across all topics</div>
-                            </div>
-                        """.format(topic_df['mentions'].sum()), unsafe_allow_html=True)
-                    
-                    with cols[2]:
-                        most_mentioned = topic_df.loc[topic_df['mentions'].idxmax()]
-                        st.markdown("""
-                            <div class="metric-container">
-                                <h3>🔝 Most Mentioned</h3>
-                                <div style="font-size: 32px; font-weight: bold; color: var(--primary-color);">
-                                    {}</div>
-                                <div style="font-size: 14px; color: #666;">
-                                    {} mentions</div>
-                            </div>
-                        """.format(most_mentioned['topic'], most_mentioned['mentions']), 
-                        unsafe_allow_html=True)
-                    
-                    with cols[3]:
-                        most_positive = topic_df.loc[topic_df['positive_ratio'].idxmax()]
-                        st.markdown("""
-                            <div class="metric-container">
-                                <h3>😊 Most Positive</h3>
-                                <div style="font-size: 32px; font-weight: bold; color: var(--primary-color);">
-                                    {}</div>
-                                <div style="font-size: 14px; color: #666;">
-                                    {:.1%} positive</div>
-                            </div>
-                        """.format(most_positive['topic'], most_positive['positive_ratio']), 
-                        unsafe_allow_html=True)
+                    most_mentioned = topic_df.loc[topic_df['mentions'].idxmax()]
+                    most_positive = topic_df.loc[topic_df['positive_ratio'].idxmax()]
+                    topic_cards = [
+                        {
+                            'title': '📊 Topics Tracked',
+                            'value': len(topics),
+                            'delta': f"{len(topic_df)} with mentions"
+                        },
+                        {
+                            'title': '🎯 Total Mentions',
+                            'value': topic_df['mentions'].sum(),
+                            'delta': 'across all topics'
+                        },
+                        {
+                            'title': '🔝 Most Mentioned',
+                            'value': most_mentioned['topic'],
+                            'delta': f"{most_mentioned['mentions']} mentions"
+                        },
+                        {
+                            'title': '😊 Most Positive',
+                            'value': most_positive['topic'],
+                            'delta': f"{most_positive['positive_ratio']:.1%} positive"
+                        }
+                    ]
+                    st.markdown(
+                        _CARD_GRID.format(''.join(_TOPIC_CARD.format(**c) for c in topic_cards)),
+                        unsafe_allow_html=True
+                    )
                     
                     # Topic Analysis Charts
                     col1, col2 = st.columns(2)
                     
                     with col1:
-                        st.markdown("""
-                            <div class="chart-container">
-                                <h3>Topic Mentions and Engagement</h3>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        fig = go.Figure()
-                        
-                        fig.add_trace(go.Bar(
-                            name='Mentions',
-                            x=topic_df['topic'],
-                            y=topic_df['mentions'],
-                            marker_color='#ff4b4b'
-                        ))
+                        st.markdown(_CHART_HEADER.format('Topic Mentions and Engagement'), unsafe_allow_html=True)
                         
-                        fig.add_trace(go.Bar(
-                            name='Avg Score',
-                            x=topic_df['topic'],
-                            y=topic_df['avg_score'],
-                            marker_color='#1e88e5',
-                            yaxis='y2'
-                        ))
-                        
-                        fig.update_layout(
-                            barmode='group',
-                            yaxis2=dict(
-                                overlaying='y',
-                                side='right'
-                            ),
-                            template='plotly_dark',
-                            paper_bgcolor='rgba(0,0,0,0)',
-                            plot_bgcolor='rgba(0,0,0,0)'
+                        st.plotly_chart(
+                            go.Figure(_topic_engagement_chart(topic_df)),
+                            use_container_width=True
                         )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
                     
                     with col2:
-                        st.markdown("""
-                            <div class="chart-container">
-                                <h3>Topic Sentiment Analysis</h3>
-                            </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(_CHART_HEADER.format('Topic Sentiment Analysis'), unsafe_allow_html=True)
                         
-                        fig = px.scatter(
-                            topic_df,
-                            x='mentions',
-                            y='avg_sentiment_score',
-                            size='avg_score',
-                            color='positive_ratio',
-                            text='topic',
-                            color_continuous_scale='RdYlGn',
-                            hover_data=['total_comments']
+                        st.plotly_chart(
+                            go.Figure(_topic_sentiment_chart(topic_df)),
+                            use_container_width=True
                         )
-                        
-                        fig.update_traces(
-                            textposition='top center',
-                            marker=dict(sizeref=2.*max(topic_df['avg_score'])/100**2)
-                        )
-                        
-                        fig.update_layout(
-                            template='plotly_dark',
-                            paper_bgcolor='rgba(0,0,0,0)',
-                            plot_bgcolor='rgba(0,0,0,0)'
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
                     
-                    # Detailed Topic Analysis
+                    # Detailed Topic Analysis: sort once by score and take
+                    # each topic's top posts from the shared ordering
+                    order = np.argsort(-processed_df['score'].to_numpy(), kind='stable')
+                    sorted_df = processed_df.iloc[order]
+                    sorted_masks = {
+                        topic: topic_mask[order]
+                        for topic, topic_mask in topic_masks.items()
+                    }
+                    
                     st.markdown("### Detailed Topic Analysis")
-                    for topic in topics:
-                        topic = topic.lower()
-                        topic_posts = processed_df[
-                            processed_df['title'].str.lower().str.contains(topic, na=False) |
-                            processed_df['text'].str.lower().str.contains(topic, na=False)
-                        ]
-                        
-                        if not topic_posts.empty:
-                            with st.expander(f"📊 Analysis for '{topic}'"):
-                                st.markdown("""
-                                    <div class="metric-container">
-                                        <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 20px;">
-                                            <div>
-                                                <h4>Total Posts</h4>
-                                                <div style="font-size: 24px; color: var(--primary-color);">
-                                                    {}</div>
-                                            </div>
-                                            <div>
-                                                <h4>Average Score</h4>
-                                                <div style="font-size: 24px; color: var(--primary-color);">
-                                                    {:.1f}</div>
-                                            </div>
-                                            <div>
-                                                <h4>Total Comments</h4>
-                                                <div style="font-size: 24px; color: var(--primary-color);">
-                                                    {}</div>
-                                            </div>
-                                            <div>
-                                                <h4>Avg Sentiment</h4>
-                                                <div style="font-size: 24px; color: var(--primary-color);">
-                                                    {:.2f}</div>
-                                            </div>
+                    # Expander metrics come from the groupby above rather
+                    # than re-reducing each topic's rows
+                    for topic_stats in topic_df.itertuples(index=False):
+                        topic = topic_stats.topic
+                        with st.expander(f"📊 Analysis for '{topic}'"):
+                            st.markdown("""
+                                <div class="metric-container">
+                                    <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 20px;">
+                                        <div>
+                                            <h4>Total Posts</h4>
+                                            <div style="font-size: 24px; color: var(--primary-color);">
+                                                {}</div>
                                         </div>
-                                    </div>
-                                """.format(
-                                    len(topic_posts),
-                                    topic_posts['score'].mean(),
-                                    topic_posts['num_comments'].sum(),
-                                    topic_posts['sentiment_score'].mean()
-                                ), unsafe_allow_html=True)
-                                
-                                # Show top posts
-                                st.markdown("#### Top Posts")
-                                for _, post in topic_posts.nlargest(3, 'score').iterrows():
-                                    st.markdown("""
-                                        <div class="metric-container" style="margin-top: 10px;">
-                                            <h4>{}</h4>
-                                            <div style="display: flex; justify-content: space-between; margin: 10px 0;">
-                                                <span>Score: {}</span>
-                                                <span>Comments: {}</span>
-                                                <span>Sentiment: {}</span>
-                                            </div>
-                                            <div style="color: #666;">{}</div>
+                                        <div>
+                                            <h4>Average Score</h4>
+                                            <div style="font-size: 24px; color: var(--primary-color);">
+                                                {:.1f}</div>
+                                        </div>
+                                        <div>
+                                            <h4>Total Comments</h4>
+                                            <div style="font-size: 24px; color: var(--primary-color);">
+                                                {}</div>
+                                        </div>
+                                        <div>
+                                            <h4>Avg Sentiment</h4>
+                                            <div style="font-size: 24px; color: var(--primary-color);">
+                                                {:.2f}</div>
                                         </div>
-                                    """.format(
-                                        post['title'],
-                                        post['score'],
-                                        post['num_comments'],
-                                        post['sentiment'],
-                                        post['text'] if post['text'] else 'No content'
-                                    ), unsafe_allow_html=True)
+                                    </div>
+                                </div>
+                            """.format(
+                                topic_stats.mentions,
+                                topic_stats.avg_score,
+                                topic_stats.total_comments,
+                                topic_stats.avg_sentiment_score
+                            ), unsafe_allow_html=True)
+                            
+                            # Show top posts
+                            st.markdown("#### Top Posts")
+                            top_rows = sorted_df.iloc[
+                                np.flatnonzero(sorted_masks[topic])[:3]
+                            ]
+                            st.markdown(''.join(
+                                _POST_CARD.format(
+                                    title=post.title,
+                                    score=post.score,
+                                    num_comments=post.num_comments,
+                                    sentiment=post.sentiment,
+                                    text=post.text or 'No content'
+                                )
+                                for post in top_rows.itertuples(index=False)
+                            ), unsafe_allow_html=True)
                 else:
                     st.warning("No mentions found for the specified topics")
                     
@@ -741,13 +1100,13 @@ class ModernRedditDashboard:
             st.error(f"Error in topic analysis: {str(e)}")
             st.info("Please check your inputs and try again")   
             
-    def show_comparative_analysis(self):
+    def show_comparative_analysis(self, params):
         """Display comparative analysis of multiple subreddits."""
         try:
             # Get subreddits list
             subreddits = [
                 sub.strip() 
-                for sub in st.session_state.get('subreddits', '').split('\n') 
+                for sub in params['subreddits'].split('\n') 
                 if sub.strip()
             ]
             
@@ -755,34 +1114,53 @@ class ModernRedditDashboard:
                 st.warning("Please enter at least two subreddits to compare")
                 return
                 
-            post_limit = st.session_state.get('post_limit', 100)
+            post_limit = params['post_limit']
+            time_filter = params['time_filter']
             
             # Loading animation
             with st.spinner("Analyzing subreddits..."):
                 placeholder = st.empty()
-                placeholder.markdown("""
-                    <div class="loading-spinner">
-                        <div class="pulse">🔄</div>
-                    </div>
-                """, unsafe_allow_html=True)
+                placeholder.markdown(_LOADING_SPINNER, unsafe_allow_html=True)
                 
                 # Collect data for each subreddit
                 all_data = []
                 failed_subreddits = []
                 progress_bar = st.progress(0)
                 
-                for idx, subreddit in enumerate(subreddits):
+                def fetch(subreddit):
                     try:
-                        df = self.reddit_collector.fetch_subreddit_data(
-                            subreddit, 
-                            post_limit
+                        processed_df, _ = _fetch_and_process(
+                            self.reddit_collector,
+                            self.data_processor,
+                            subreddit,
+                            post_limit,
+                            time_filter
                         )
-                        processed_df, insights = self.data_processor.process_reddit_data(df)
-                        processed_df['subreddit'] = subreddit
-                        all_data.append(processed_df)
+                        return processed_df, None
                     except Exception as e:
-                        failed_subreddits.append((subreddit, str(e)))
-                    progress_bar.progress((idx + 1) / len(subreddits))
+                        return None, str(e)
+                
+                # Reddit requests are network-bound, so overlap them and
+                # advance the progress bar as each one finishes
+                results = {}
+                with ThreadPoolExecutor(max_workers=min(len(subreddits), 8)) as executor:
+                    futures = {executor.submit(fetch, sub): sub for sub in subreddits}
+                    for idx, future in enumerate(as_completed(futures)):
+                        results[futures[future]] = future.result()
+                        progress_bar.progress((idx + 1) / len(subreddits))
+                
+                # Assemble in input order so charts keep a stable layout; a
+                # shared categorical dtype lets concat keep subreddit as codes
+                subreddit_dtype = pd.CategoricalDtype(list(dict.fromkeys(subreddits)))
+                for subreddit in subreddits:
+                    processed_df, error = results[subreddit]
+                    if error is None:
+                        processed_df['subreddit'] = pd.Series(
+                            subreddit, index=processed_df.index, dtype=subreddit_dtype
+                        )
+                        all_data.append(processed_df)
+                    else:
+                        failed_subreddits.append((subreddit, error))
                 
                 placeholder.empty()
                 
@@ -792,7 +1170,9 @@ class ModernRedditDashboard:
                         st.error(f"r/{sub}: {error}")
                 
                 if all_data:
-                    combined_df = pd.concat(all_data)
+                    # Narrowed dtypes and categoricals from the processor carry
+                    # through, since every frame shares the same schema
+                    combined_df = pd.concat(all_data, ignore_index=True, sort=False)
                     
                     # Summary metrics
                     st.markdown("""
@@ -801,49 +1181,37 @@ class ModernRedditDashboard:
                         </div>
                     """, unsafe_allow_html=True)
                     
-                    # Calculate summary stats
-                    summary_data = []
-                    for subreddit in subreddits:
-                        sub_data = combined_df[combined_df['subreddit'] == subreddit]
-                        if not sub_data.empty:
-                            summary_data.append({
-                                'subreddit': subreddit,
-                                'total_posts': len(sub_data),
-                                'avg_score': sub_data['score'].mean(),
-                                'total_comments': sub_data['num_comments'].sum(),
-                                'positive_ratio': (sub_data['sentiment'] == 'positive').mean() * 100,
-                                'avg_sentiment': sub_data['sentiment_score'].mean()
-                            })
+                    # Calculate summary stats in one grouped pass, keeping
+                    # the subreddits in the order they were entered
+                    summary_df = (
+                        combined_df
+                        .assign(is_positive=combined_df['sentiment'] == 'positive')
+                        .groupby('subreddit', observed=True, sort=False)
+                        .agg(
+                            total_posts=('score', 'size'),
+                            avg_score=('score', 'mean'),
+                            total_comments=('num_comments', 'sum'),
+                            positive_ratio=('is_positive', 'mean'),
+                            avg_sentiment=('sentiment_score', 'mean')
+                        )
+                    )
+                    summary_df['positive_ratio'] *= 100
+                    subreddit_order = summary_df.index.tolist()
                     
-                    # Display summary cards
-                    cols = st.columns(len(summary_data))
-                    for idx, sub_data in enumerate(summary_data):
-                        with cols[idx]:
-                            st.markdown(f"""
-                                <div class="metric-container">
-                                    <h3>r/{sub_data['subreddit']}</h3>
-                                    <div style="margin: 15px 0;">
-                                        <div style="font-size: 14px; color: #666;">Posts</div>
-                                        <div style="font-size: 24px; color: var(--primary-color);">
-                                            {sub_data['total_posts']:,}</div>
-                                    </div>
-                                    <div style="margin: 15px 0;">
-                                        <div style="font-size: 14px; color: #666;">Avg Score</div>
-                                        <div style="font-size: 24px; color: var(--primary-color);">
-                                            {sub_data['avg_score']:,.1f}</div>
-                                    </div>
-                                    <div style="margin: 15px 0;">
-                                        <div style="font-size: 14px; color: #666;">Comments</div>
-                                        <div style="font-size: 24px; color: var(--primary-color);">
-                                            {sub_data['total_comments']:,}</div>
-                                    </div>
-                                    <div style="margin: 15px 0;">
-                                        <div style="font-size: 14px; color: #666;">Positive Sentiment</div>
-                                        <div style="font-size: 24px; color: var(--primary-color);">
-                                            {sub_data['positive_ratio']:.1f}%</div>
-                                    </div>
-                                </div>
-                            """, unsafe_allow_html=True)
+                    # Display summary cards as one flex row
+                    st.markdown(
+                        _CARD_ROW.format(''.join(
+                            _SUBREDDIT_CARD.format(
+                                subreddit=row.subreddit,
+                                total_posts=f"{row.total_posts:,}",
+                                avg_score=f"{row.avg_score:,.1f}",
+                                total_comments=f"{row.total_comments:,}",
+                                positive_ratio=f"{row.positive_ratio:.1f}"
+                            )
+                            for row in summary_df.reset_index().itertuples(index=False)
+                        )),
+                        unsafe_allow_html=True
+                    )
                     
                     # Visualization tabs
                     tab_sentiment, tab_engagement, tab_activity, tab_posts = st.tabs([
@@ -857,151 +1225,92 @@ class ModernRedditDashboard:
                         col1, col2 = st.columns(2)
                         
                         with col1:
-                            st.markdown("""
-                                <div class="chart-container">
-                                    <h3>Sentiment Distribution</h3>
-                                </div>
-                            """, unsafe_allow_html=True)
+                            st.markdown(_CHART_HEADER.format('Sentiment Distribution'), unsafe_allow_html=True)
                             
-                            fig = px.histogram(
-                                combined_df,
-                                x='sentiment',
-                                color='subreddit',
-                                barmode='group',
-                                title=None,
-                                template='plotly_dark'
+                            st.plotly_chart(
+                                go.Figure(_sentiment_distribution_chart(
+                                    combined_df[['sentiment', 'subreddit']]
+                                )),
+                                use_container_width=True
                             )
-                            
-                            fig.update_layout(
-                                paper_bgcolor='rgba(0,0,0,0)',
-                                plot_bgcolor='rgba(0,0,0,0)'
-                            )
-                            
-                            st.plotly_chart(fig, use_container_width=True)
                         
                         with col2:
-                            st.markdown("""
-                                <div class="chart-container">
-                                    <h3>Average Sentiment Score</h3>
-                                </div>
-                            """, unsafe_allow_html=True)
-                            
-                            fig = go.Figure()
+                            st.markdown(_CHART_HEADER.format('Average Sentiment Score'), unsafe_allow_html=True)
                             
-                            for subreddit in subreddits:
-                                sub_data = combined_df[combined_df['subreddit'] == subreddit]
-                                fig.add_trace(go.Box(
-                                    y=sub_data['sentiment_score'],
-                                    name=subreddit,
-                                    boxpoints='outliers'
-                                ))
-                            
-                            fig.update_layout(
-                                template='plotly_dark',
-                                paper_bgcolor='rgba(0,0,0,0)',
-                                plot_bgcolor='rgba(0,0,0,0)'
+                            st.plotly_chart(
+                                go.Figure(_subreddit_box_chart(
+                                    combined_df[['subreddit', 'sentiment_score']],
+                                    'sentiment_score',
+                                    subreddit_order
+                                )),
+                                use_container_width=True
                             )
-                            
-                            st.plotly_chart(fig, use_container_width=True)
                     
                     with tab_engagement:
                         col1, col2 = st.columns(2)
                         
                         with col1:
-                            st.markdown("""
-                                <div class="chart-container">
-                                    <h3>Post Score Distribution</h3>
-                                </div>
-                            """, unsafe_allow_html=True)
-                            
-                            fig = go.Figure()
+                            st.markdown(_CHART_HEADER.format('Post Score Distribution'), unsafe_allow_html=True)
                             
-                            for subreddit in subreddits:
-                                sub_data = combined_df[combined_df['subreddit'] == subreddit]
-                                fig.add_trace(go.Box(
-                                    y=sub_data['score'],
-                                    name=subreddit,
-                                    boxpoints='outliers'
-                                ))
-                            
-                            fig.update_layout(
-                                template='plotly_dark',
-                                paper_bgcolor='rgba(0,0,0,0)',
-                                plot_bgcolor='rgba(0,0,0,0)'
+                            st.plotly_chart(
+                                go.Figure(_subreddit_box_chart(
+                                    combined_df[['subreddit', 'score']],
+                                    'score',
+                                    subreddit_order
+                                )),
+                                use_container_width=True
                             )
-                            
-                            st.plotly_chart(fig, use_container_width=True)
                         
                         with col2:
-                            st.markdown("""
-                                <div class="chart-container">
-                                    <h3>Comment Distribution</h3>
-                                </div>
-                            """, unsafe_allow_html=True)
+                            st.markdown(_CHART_HEADER.format('Comment Distribution'), unsafe_allow_html=True)
                             
-                            fig = go.Figure()
-                            
-                            for subreddit in subreddits:
-                                sub_data = combined_df[combined_df['subreddit'] == subreddit]
-                                fig.add_trace(go.Box(
-                                    y=sub_data['num_comments'],
-                                    name=subreddit,
-                                    boxpoints='outliers'
-                                ))
-                            
-                            fig.update_layout(
-                                template='plotly_dark',
-                                paper_bgcolor='rgba(0,0,0,0)',
-                                plot_bgcolor='rgba(0,0,0,0)'
+                            st.plotly_chart(
+                                go.Figure(_subreddit_box_chart(
+                                    combined_df[['subreddit', 'num_comments']],
+                                    'num_comments',
+                                    subreddit_order
+                                )),
+                                use_container_width=True
                             )
-                            
-                            st.plotly_chart(fig, use_container_width=True)
                     
                     with tab_activity:
-                        st.markdown("""
-                            <div class="chart-container">
-                                <h3>Posting Activity by Hour</h3>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        combined_df['hour'] = combined_df['created_utc'].dt.hour
-                        activity_df = combined_df.groupby(['subreddit', 'hour']).size().reset_index(name='posts')
+                        st.markdown(_CHART_HEADER.format('Posting Activity by Hour'), unsafe_allow_html=True)
                         
-                        fig = px.line(
-                            activity_df,
-                            x='hour',
-                            y='posts',
-                            color='subreddit',
-                            template='plotly_dark'
+                        st.plotly_chart(
+                            go.Figure(_hourly_activity_chart(
+                                combined_df[['hour_of_day', 'subreddit']]
+                            )),
+                            use_container_width=True
                         )
-                        
-                        fig.update_layout(
-                            paper_bgcolor='rgba(0,0,0,0)',
-                            plot_bgcolor='rgba(0,0,0,0)'
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
                     
                     with tab_posts:
                         st.markdown("### Top Posts by Subreddit")
-                        for subreddit in subreddits:
-                            with st.expander(f"📊 Top Posts from r/{subreddit}"):
-                                sub_posts = combined_df[
-                                    combined_df['subreddit'] == subreddit
-                                ].nlargest(3, 'score')
-                                
-                                for _, post in sub_posts.iterrows():
-                                    st.markdown(f"""
-                                        <div class="metric-container" style="margin-top: 10px;">
-                                            <h4>{post['title']}</h4>
-                                            <div style="display: flex; justify-content: space-between; margin: 10px 0;">
-                                                <span>Score: {post['score']:,}</span>
-                                                <span>Comments: {post['num_comments']:,}</span>
-                                                <span>Sentiment: {post['sentiment']}</span>
-                                            </div>
-                                            <div style="color: #666;">{post['text'] if post['text'] else 'No content'}</div>
-                                        </div>
-                                    """, unsafe_allow_html=True)
+                        # One sort, then the first three rows of each subreddit
+                        top_posts = (
+                            combined_df
+                            .sort_values('score', ascending=False, kind='stable')
+                            .groupby('subreddit', observed=True, sort=False)
+                            .head(3)
+                        )
+                        # Native <details> blocks, emitted together
+                        st.markdown(''.join(
+                            _POST_DETAILS.format(
+                                subreddit=subreddit,
+                                posts=''.join(
+                                    _POST_CARD.format(
+                                        title=post.title,
+                                        score=f"{post.score:,}",
+                                        num_comments=f"{post.num_comments:,}",
+                                        sentiment=post.sentiment,
+                                        text=post.text or 'No content'
+                                    )
+                                    for post in top_posts[
+                                        top_posts['subreddit'] == subreddit
+                                    ].itertuples(index=False)
+                                )
+                            )
+                            for subreddit in subreddit_order
+                        ), unsafe_allow_html=True)
                                     
                 else:
                     st.error("Could not fetch data for any of the specified subreddits")
@@ -1012,13 +1321,10 @@ class ModernRedditDashboard:
 
     def show_engagement_metrics(self, df):
         """Display engagement analysis."""
-        st.markdown("""
-            <div class="chart-container">
-                <h3>Post Engagement Analysis</h3>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_CHART_HEADER.format('Post Engagement Analysis'), unsafe_allow_html=True)
         
-        # Scatter plot
+        # Scatter plot, drawn with WebGL so large post counts stay responsive;
+        # browsers cap WebGL contexts per tab, so keep this to per-post plots
         fig = px.scatter(
             df,
             x='score',
@@ -1026,6 +1332,7 @@ class ModernRedditDashboard:
             color='sentiment',
             size='sentiment_score',
             hover_data=['title'],
+            render_mode='webgl',
             color_discrete_map={
                 'positive': '#28a745',
                 'negative': '#dc3545',
@@ -1033,48 +1340,33 @@ class ModernRedditDashboard:
             }
         )
         
-        fig.update_layout(
-            template='plotly_dark',
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)'
-        )
-        
         st.plotly_chart(fig, use_container_width=True)
         
         # Engagement timeline
-        st.markdown("""
-            <div class="chart-container">
-                <h3>Engagement Over Time</h3>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_CHART_HEADER.format('Engagement Over Time'), unsafe_allow_html=True)
         
-        df['date'] = df['created_utc'].dt.date
-        daily_metrics = df.groupby('date').agg({
+        post_date = df['created_utc'].dt.date.rename('date')
+        daily_metrics = df.groupby(post_date).agg({
             'score': 'mean',
             'num_comments': 'mean'
         }).reset_index()
         
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=daily_metrics['date'],
-            y=daily_metrics['score'],
-            name='Average Score',
-            line=dict(color='#ff4b4b', width=3)
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=daily_metrics['date'],
-            y=daily_metrics['num_comments'],
-            name='Average Comments',
-            line=dict(color='#1e88e5', width=3)
-        ))
-        
-        fig.update_layout(
-            template='plotly_dark',
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)'
-        )
+        # Long ranges are thinned to their per-bucket extremes
+        dates = daily_metrics['date'].to_numpy()
+        for column, name, color in (
+            ('score', 'Average Score', '#ff4b4b'),
+            ('num_comments', 'Average Comments', '#1e88e5')
+        ):
+            values = daily_metrics[column].to_numpy()
+            keep = _minmax_indices(values)
+            fig.add_trace(go.Scatter(
+                x=dates[keep],
+                y=values[keep],
+                name=name,
+                line=dict(color=color, width=3)
+            ))
         
         st.plotly_chart(fig, use_container_width=True)
 
@@ -1090,25 +1382,25 @@ class ModernRedditDashboard:
         
         with tabs[2]:
             recent_df = df[
-                df['created_utc'] > datetime.now() - timedelta(hours=24)
+                df['created_utc'] > datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=24)
             ]
             self.show_post_cards(recent_df.nlargest(5, 'score'))
 
     def show_post_cards(self, posts):
         """Display posts in modern cards."""
-        for _, post in posts.iterrows():
-            with st.expander(f"📝 {post['title'][:100]}...", expanded=True):
+        for post in posts.itertuples(index=False):
+            with st.expander(f"📝 {post.title[:100]}...", expanded=True):
                 st.markdown(f"""
                     <div class="metric-container">
                         <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
-                            <span style="color: {'#28a745' if post['sentiment']=='positive' else '#dc3545' if post['sentiment']=='negative' else '#6c757d'}">
-                                {post['sentiment'].title()} ({post['sentiment_score']:.2f})
+                            <span style="color: {'#28a745' if post.sentiment=='positive' else '#dc3545' if post.sentiment=='negative' else '#6c757d'}">
+                                {post.sentiment.title()} ({post.sentiment_score:.2f})
                             </span>
-                            <span>Score: {post['score']:,}</span>
-                            <span>Comments: {post['num_comments']:,}</span>
+                            <span>Score: {post.score:,}</span>
+                            <span>Comments: {post.num_comments:,}</span>
                         </div>
                         <div style="margin-top: 10px;">
-                            {post['text'] if post['text'] else 'No content'}
+                            {post.text if post.text else 'No content'}
                         </div>
                     </div>
                 """, unsafe_allow_html=True)
@@ -4,8 +4,6 @@ import time
 from datetime import datetime
 import plotly
 import praw
-from transformers import pipeline
-import yfinance as yf
 
 def check_dependencies():
     """Check if all required packages are working."""
@@ -45,22 +43,46 @@ def check_dependencies():
     except Exception as e:
         results["PRAW"] = f"✗ ({str(e)})"
     
-    # Check Transformers
+    # Check Transformers (import only; loading a model is not a dependency check)
     try:
-        sentiment = pipeline("sentiment-analysis")
+        import transformers
+        assert transformers.__version__
         results["Transformers"] = "✓"
     except Exception as e:
         results["Transformers"] = f"✗ ({str(e)})"
     
     # Check yfinance
     try:
-        yf.download("AAPL", period="1d")
+        import yfinance
+        assert yfinance.__version__
         results["yfinance"] = "✓"
     except Exception as e:
         results["yfinance"] = f"✗ ({str(e)})"
     
     return results
 
+def check_network():
+    """Test live downloads from the model hub and Yahoo Finance."""
+    results = {}
+    
+    # Check sentiment model download
+    try:
+        from transformers import pipeline
+        pipeline("sentiment-analysis")
+        results["Transformers model"] = "✓"
+    except Exception as e:
+        results["Transformers model"] = f"✗ ({str(e)})"
+    
+    # Check Yahoo Finance
+    try:
+        import yfinance as yf
+        yf.download("AAPL", period="1d")
+        results["yfinance download"] = "✓"
+    except Exception as e:
+        results["yfinance download"] = f"✗ ({str(e)})"
+    
+    return results
+
 def check_reddit_api():
     """Test Reddit API connectivity."""
     try:
@@ -71,8 +93,13 @@ def check_reddit_api():
     except Exception as e:
         return f"✗ Error: {str(e)}"
 
-def run_system_check():
-    """Run complete system check."""
+def run_system_check(include_network=False):
+    """
+    Run complete system check.
+    
+    Args:
+        include_network: Also download the sentiment model and a stock quote
+    """
     print("Starting System Check...")
     print("=" * 50)
     
@@ -82,6 +109,12 @@ def run_system_check():
     for package, status in results.items():
         print(f"{package}: {status}")
     
+    # Check network downloads (opt-in)
+    if include_network:
+        print("\nChecking Network:")
+        for service, status in check_network().items():
+            print(f"{service}: {status}")
+    
     # Check Reddit API
     print("\nChecking Reddit API:")
     api_status = check_reddit_api()
@@ -106,4 +139,5 @@ def run_system_check():
     print("\nSystem Check Complete!")
 
 if __name__ == "__main__":
-    run_system_check()
\ No newline at end of file
+    import sys
+    run_system_check(include_network="--network" in sys.argv)
\ No newline at end of file
@@ -3,7 +3,6 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 import plotly.graph_objects as go
-import base64
 from pathlib import Path
 
 def load_css(css_file: Path) -> None:
@@ -11,13 +10,6 @@ def load_css(css_file: Path) -> None:
     with open(css_file) as f:
         st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
 
-def create_download_link(df: pd.DataFrame, filename: str) -> str:
-    """Create a download link for dataframe."""
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">Download CSV</a>'
-    return href
-
 def format_number(num: float) -> str:
     """Format large numbers for display."""
     if num >= 1_000_000:
@@ -35,12 +27,17 @@ def calculate_growth(current: float, previous: float) -> tuple:
     return growth, direction
 
 def create_time_filters(df: pd.DataFrame, time_col: str) -> pd.DataFrame:
-    """Create time-based filters for dataframe."""
+    """Create time-based filters for dataframe.
+
+    Returns a new DataFrame; the input is left untouched.
+    """
     now = datetime.now()
-    df['hour'] = pd.to_datetime(df[time_col]).dt.hour
-    df['day'] = pd.to_datetime(df[time_col]).dt.day_name()
-    df['is_today'] = pd.to_datetime(df[time_col]).dt.date == now.date()
-    return df
+    timestamps = pd.to_datetime(df[time_col])
+    return df.assign(
+        hour=timestamps.dt.hour,
+        day=timestamps.dt.day_name(),
+        is_today=timestamps.dt.date == now.date()
+    )
 
 def create_custom_theme() -> Dict:
     """Create a custom theme for Plotly charts."""
@@ -56,13 +53,9 @@ def create_custom_theme() -> Dict:
     }
 
 def apply_custom_theme_to_figure(fig: go.Figure) -> go.Figure:
-    """Apply custom theme to Plotly figure."""
-    fig.update_layout(
-        font={'family': 'Arial, sans-serif'},
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        paper_bgcolor='rgba(0, 0, 0, 0)',
-        title={'font': {'size': 24}},
-        xaxis={'gridcolor': '#eee'},
-        yaxis={'gridcolor': '#eee'}
-    )
+    """Apply custom theme to Plotly figure.
+
+    The dashboard registers its theme as the default Plotly template, so
+    figures already carry it and are returned unchanged.
+    """
     return fig
\ No newline at end of file
@@ -8,9 +8,11 @@ setup(
         'streamlit',
         'praw',
         'pandas',
+        'pyarrow',
+        'cachetools',
         'numpy',
         'plotly',
-        'textblob',
+        'vaderSentiment',
         'wordcloud',
         'transformers',
         'torch',
@@ -20,7 +22,13 @@ setup(
         'pytest',
         'pytest-mock',
         'pytest-cov',
+        'pytest-xdist',
+        'pytest-benchmark',
+        'filelock',
         'scikit-learn',
         'emoji==0.6.0'  # Added emoji package
-    ]
+    ],
+    extras_require={
+        'onnx': ['optimum[onnxruntime]']  # INT8 sentiment model
+    }
 )
\ No newline at end of file
@@ -17,14 +17,23 @@ REDDIT_CONFIG = {
 MODEL_CONFIG = {
     'sentiment_model': "finiteautomata/bertweet-base-sentiment-analysis",
     'batch_size': 32,
-    'cache_dir': './models/cache'
+    'cache_dir': './models/cache',
+    'use_onnx': True,  # INT8 ONNX Runtime model when optimum is installed
+    'onnx_dir': './models/bertweet-int8',  # Quantized model, built on first use
+    'torch_compile': True,  # torch.compile the PyTorch model (ignored for ONNX)
+    'result_cache_size': 8192  # Model outputs kept per analyzer, keyed by text
 }
 
 # Data Configurations
 DATA_CONFIG = {
     'cache_duration': 3600,  # Cache duration in seconds
     'max_posts': 1000,
-    'default_timeframe': '24h'
+    'default_timeframe': '24h',
+    'cache_dir': './cache',  # On-disk cache of processed subreddit results
+    'disk_cache_ttl': 600,  # Seconds before a disk cache entry is refetched
+    'stock_cache_dir': './cache/stocks',  # On-disk cache of price histories
+    'stock_cache_ttl_intraday': 3600,  # Minute/hour bars go stale quickly
+    'stock_cache_ttl_daily': 86400  # Daily and longer bars
 }
 
 # Setup logging
@@ -1,16 +1,32 @@
 import praw
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 import logging
 from typing import Dict, List, Optional
-from functools import lru_cache
 import time
+import threading
 from prawcore.exceptions import PrawcoreException
 from .config import REDDIT_CONFIG, DATA_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Columns of the post DataFrame, kept explicit so empty listings still
+# produce a frame with the expected schema
+POST_COLUMNS = [
+    'id', 'title', 'text', 'score', 'created_utc', 'num_comments',
+    'upvote_ratio', 'author', 'url', 'is_self'
+]
+
+# Free-text post columns stored with the PyArrow string backend
+STRING_COLUMNS = ('id', 'title', 'text', 'author', 'url')
+
+COMMENT_COLUMNS = [
+    'id', 'text', 'score', 'created_utc', 'author', 'is_submitter'
+]
+
+# Most subreddit listings held by one collector's cache
+MAX_CACHE_ENTRIES = 32
+
 class RedditDataCollector:
     """
     A class to collect and process Reddit data.
@@ -18,6 +34,7 @@ class RedditDataCollector:
     Attributes:
         reddit: PRAW Reddit instance
         cache_duration: How long to cache results
+        _cache: (subreddit, limit, timeframe) -> (fetch time, DataFrame)
     """
     
     def __init__(self, cache_duration: int = DATA_CONFIG['cache_duration']):
@@ -34,12 +51,13 @@ class RedditDataCollector:
                 user_agent=REDDIT_CONFIG['user_agent']
             )
             self.cache_duration = cache_duration
+            self._cache: Dict[tuple, tuple] = {}
+            self._cache_lock = threading.Lock()
             logger.info("Reddit client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Reddit client: {str(e)}")
             raise
 
-    @lru_cache(maxsize=32)
     def fetch_subreddit_data(
         self, 
         subreddit_name: str, 
@@ -49,6 +67,9 @@ class RedditDataCollector:
         """
         Fetch posts from specified subreddit with caching.
         
+        Results are kept for cache_duration seconds and callers always get
+        a copy, so modifying a returned DataFrame never touches the cache.
+        
         Args:
             subreddit_name: Name of the subreddit
             limit: Maximum number of posts to fetch
@@ -57,10 +78,16 @@ class RedditDataCollector:
         Returns:
             DataFrame containing post data
         """
+        key = (subreddit_name, limit, timeframe)
+        now = time.time()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < self.cache_duration:
+            return hit[1].copy()
+
         try:
             logger.info(f"Fetching data from r/{subreddit_name}")
             subreddit = self.reddit.subreddit(subreddit_name)
-            posts_data = []
             
             # Use different sorting based on timeframe
             if timeframe == 'hour':
@@ -68,28 +95,37 @@ class RedditDataCollector:
             else:
                 posts = subreddit.hot(limit=limit)
             
-            for post in posts:
-                try:
-                    post_data = {
-                        'id': post.id,
-                        'title': post.title,
-                        'text': post.selftext,
-                        'score': post.score,
-                        'created_utc': datetime.fromtimestamp(post.created_utc),
-                        'num_comments': post.num_comments,
-                        'upvote_ratio': post.upvote_ratio,
-                        'author': str(post.author),
-                        'url': post.url,
-                        'is_self': post.is_self
-                    }
-                    posts_data.append(post_data)
-                except Exception as e:
-                    logger.warning(f"Error processing post {post.id}: {str(e)}")
-                    continue
+            # Read each attribute once; timestamps stay raw epoch seconds
+            # and are converted for the whole column below
+            posts_data = [
+                (
+                    post.id,
+                    post.title,
+                    post.selftext,
+                    post.score,
+                    post.created_utc,
+                    post.num_comments,
+                    post.upvote_ratio,
+                    post.author.name if post.author else None,
+                    post.url,
+                    post.is_self
+                )
+                for post in posts
+            ]
             
-            df = pd.DataFrame(posts_data)
+            df = pd.DataFrame.from_records(posts_data, columns=POST_COLUMNS)
+            df['created_utc'] = pd.to_datetime(df['created_utc'], unit='s')
+            # Arrow-backed strings: contiguous buffers and vectorized .str ops
+            df = df.astype({column: 'string[pyarrow]' for column in STRING_COLUMNS})
             logger.info(f"Successfully fetched {len(df)} posts from r/{subreddit_name}")
-            return df
+            
+            with self._cache_lock:
+                self._cache.pop(key, None)
+                self._cache[key] = (now, df)
+                # Evict the oldest entries (dicts keep insertion order)
+                while len(self._cache) > MAX_CACHE_ENTRIES:
+                    self._cache.pop(next(iter(self._cache)))
+            return df.copy()
             
         except PrawcoreException as e:
             logger.error(f"Reddit API error: {str(e)}")
@@ -117,23 +153,21 @@ class RedditDataCollector:
             submission = self.reddit.submission(id=post_id)
             submission.comments.replace_more(limit=0)
             
-            comments = []
-            for comment in submission.comments[:limit]:
-                try:
-                    comment_data = {
-                        'id': comment.id,
-                        'text': comment.body,
-                        'score': comment.score,
-                        'created_utc': datetime.fromtimestamp(comment.created_utc),
-                        'author': str(comment.author),
-                        'is_submitter': comment.is_submitter
-                    }
-                    comments.append(comment_data)
-                except Exception as e:
-                    logger.warning(f"Error processing comment {comment.id}: {str(e)}")
-                    continue
-                    
-            return comments
+            comments_data = [
+                (
+                    comment.id,
+                    comment.body,
+                    comment.score,
+                    comment.created_utc,
+                    comment.author.name if comment.author else None,
+                    comment.is_submitter
+                )
+                for comment in submission.comments[:limit]
+            ]
+            
+            comments = pd.DataFrame.from_records(comments_data, columns=COMMENT_COLUMNS)
+            comments['created_utc'] = pd.to_datetime(comments['created_utc'], unit='s')
+            return comments.to_dict('records')
             
         except Exception as e:
             logger.error(f"Error fetching comments for post {post_id}: {str(e)}")
@@ -4,11 +4,26 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
+import threading
 from .utils import TextPreprocessor, DataProcessor, MetricsCalculator, DataValidator
-from .sentiment_analyzer import SentimentAnalyzer
+from .sentiment_analyzer import SentimentAnalyzer, SENTIMENT_LABELS
 
 logger = logging.getLogger(__name__)
 
+# Process-wide analyzer shared by processors created without one, so the
+# sentiment model is loaded once rather than per instance
+_DEFAULT_ANALYZER: Optional[SentimentAnalyzer] = None
+_DEFAULT_ANALYZER_LOCK = threading.Lock()
+
+def _get_default_analyzer() -> SentimentAnalyzer:
+    """Return the shared SentimentAnalyzer, creating it on first use."""
+    global _DEFAULT_ANALYZER
+    if _DEFAULT_ANALYZER is None:
+        with _DEFAULT_ANALYZER_LOCK:
+            if _DEFAULT_ANALYZER is None:
+                _DEFAULT_ANALYZER = SentimentAnalyzer()
+    return _DEFAULT_ANALYZER
+
 class RedditDataProcessor:
     """
     Class for processing and analyzing Reddit data.
@@ -22,12 +37,13 @@ class RedditDataProcessor:
         Initialize the data processor.
         
         Args:
-            sentiment_analyzer: Optional sentiment analyzer instance
+            sentiment_analyzer: Optional sentiment analyzer instance;
+                defaults to the shared process-wide analyzer
         """
         self.text_processor = TextPreprocessor()
         self.metrics_calculator = MetricsCalculator()
         self.data_validator = DataValidator()
-        self.sentiment_analyzer = sentiment_analyzer or SentimentAnalyzer()
+        self.sentiment_analyzer = sentiment_analyzer or _get_default_analyzer()
 
     def process_reddit_data(
         self, 
@@ -48,22 +64,39 @@ class RedditDataProcessor:
                 raise ValueError("Invalid Reddit data format")
 
             # Clean text
-            df['clean_title'] = df['title'].apply(self.text_processor.clean_text)
-            df['clean_text'] = df['text'].apply(self.text_processor.clean_text)
+            df['clean_title'] = self.text_processor.clean_series(df['title'])
+            df['clean_text'] = self.text_processor.clean_series(df['text'])
 
             # Extract features
-            df['mentions'] = df['clean_text'].apply(self.text_processor.extract_mentions)
-            df['tickers'] = df['clean_text'].apply(self.text_processor.extract_tickers)
+            df['mentions'] = self.text_processor.extract_mentions_series(df['clean_text'])
+            df['tickers'] = self.text_processor.extract_tickers_series(df['clean_text'])
 
             # Calculate engagement metrics
             df = DataProcessor.calculate_engagement_metrics(df)
 
             # Analyze sentiment
             sentiment_results = self.sentiment_analyzer.analyze_texts_batch(
-                df['clean_title'] + " " + df['clean_text']
+                df['clean_title'].str.cat(df['clean_text'], sep=' ', na_rep='').tolist()
+            )
+            n_results = len(sentiment_results)
+            df['sentiment'] = pd.Categorical(
+                np.fromiter(
+                    (r['label'] for r in sentiment_results),
+                    dtype=object, count=n_results
+                ),
+                categories=SENTIMENT_LABELS
+            )
+            df['sentiment_score'] = np.fromiter(
+                (r['score'] for r in sentiment_results),
+                dtype=np.float32, count=n_results
             )
-            df['sentiment'] = [r['label'] for r in sentiment_results]
-            df['sentiment_score'] = [r['score'] for r in sentiment_results]
+
+            # Narrow numeric columns: counts fit in int32, ratios in float32
+            df = df.astype({
+                'score': 'int32',
+                'num_comments': 'int32',
+                'upvote_ratio': 'float32'
+            })
 
             # Calculate insights
             insights = self._calculate_insights(df)
@@ -102,15 +135,22 @@ class RedditDataProcessor:
             insights['sentiment_distribution'] = sentiment_counts.to_dict()
 
             # Top tickers
-            all_tickers = [ticker for tickers in df['tickers'] for ticker in tickers]
-            ticker_counts = pd.Series(all_tickers).value_counts()
+            ticker_counts = df['tickers'].explode().dropna().value_counts()
             insights['top_tickers'] = ticker_counts.head(10).to_dict()
 
             # Engagement stats
+            # Top 5 by engagement via a partial sort; NaN scores rank last
+            engagement = np.nan_to_num(
+                df['engagement_score'].to_numpy(dtype=np.float64), nan=-np.inf
+            )
+            k = min(5, len(engagement))
+            top_idx = np.argpartition(engagement, -k)[-k:] if k else np.arange(0)
+            top_idx = top_idx[np.argsort(-engagement[top_idx], kind='stable')]
+
             insights['engagement_stats'] = {
                 'avg_score': df['score'].mean(),
                 'avg_comments': df['num_comments'].mean(),
-                'top_posts': df.nlargest(5, 'engagement_score')[
+                'top_posts': df.iloc[top_idx][
                     ['title', 'engagement_score']
                 ].to_dict('records')
             }
@@ -179,31 +219,22 @@ class RedditDataProcessor:
         Returns:
             Dictionary of ticker sentiment metrics
         """
-        ticker_sentiment = {}
+        sentiments = ['positive', 'negative', 'neutral']
         
         try:
-            for idx, row in df.iterrows():
-                for ticker in row['tickers']:
-                    if ticker not in ticker_sentiment:
-                        ticker_sentiment[ticker] = {
-                            'positive': 0,
-                            'negative': 0,
-                            'neutral': 0,
-                            'total_mentions': 0
-                        }
-                    
-                    ticker_sentiment[ticker][row['sentiment']] += 1
-                    ticker_sentiment[ticker]['total_mentions'] += 1
-
-            # Calculate percentages
-            for ticker in ticker_sentiment:
-                total = ticker_sentiment[ticker]['total_mentions']
-                for sentiment in ['positive', 'negative', 'neutral']:
-                    ticker_sentiment[ticker][f'{sentiment}_ratio'] = (
-                        ticker_sentiment[ticker][sentiment] / total
-                    )
-
-            return ticker_sentiment
+            # One row per (post, ticker) mention
+            mentions = df[['tickers', 'sentiment']].explode('tickers').dropna(subset=['tickers'])
+            counts = pd.crosstab(
+                mentions['tickers'], mentions['sentiment']
+            ).reindex(columns=sentiments, fill_value=0)
+            # Plain column index so the derived columns can be added
+            counts.columns = list(counts.columns)
+
+            counts['total_mentions'] = counts[sentiments].sum(axis=1)
+            ratios = counts[sentiments].div(counts['total_mentions'], axis=0)
+            counts[[f'{sentiment}_ratio' for sentiment in sentiments]] = ratios.to_numpy()
+
+            return counts.to_dict('index')
 
         except Exception as e:
             logger.error(f"Error calculating ticker sentiment: {str(e)}")
@@ -1,11 +1,23 @@
 import logging
-from typing import Dict, List, Union
+import os
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Union
+import numpy as np
 import pandas as pd
 from transformers import pipeline
-from textblob import TextBlob  # Fallback option
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer  # Fallback option
+from cachetools import LRUCache
+from .config import MODEL_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Canonical sentiment labels, in category order
+SENTIMENT_LABELS = ('positive', 'neutral', 'negative')
+
+# The BERTweet model reports abbreviated labels
+_LABEL_MAP = {'POS': 'positive', 'NEU': 'neutral', 'NEG': 'negative'}
+
 class SentimentAnalyzer:
     """A class for analyzing sentiment in text using transformer models or fallback methods."""
     
@@ -17,23 +29,130 @@ class SentimentAnalyzer:
             use_transformers: Whether to use transformer models (requires PyTorch)
         """
         self.use_transformers = use_transformers
+        # Model outputs by text, so repeated titles skip tokenization and
+        # inference; the lock covers sessions sharing one analyzer
+        self._result_cache = LRUCache(maxsize=MODEL_CONFIG['result_cache_size'])
+        self._result_cache_lock = threading.Lock()
+        # The pipeline is not thread-safe, and the dashboard shares one
+        # analyzer across sessions and fetch workers
+        self._model_lock = threading.Lock()
+        self._vader = SentimentIntensityAnalyzer()
         
         try:
             if self.use_transformers:
-                self.sentiment_model = pipeline(
-                    "sentiment-analysis",
-                    model="finiteautomata/bertweet-base-sentiment-analysis"
+                self.sentiment_model = (
+                    self._load_onnx_pipeline() if MODEL_CONFIG['use_onnx'] else None
                 )
+                warmed_up = False
+                if self.sentiment_model is None:
+                    self.sentiment_model = pipeline(
+                        "sentiment-analysis",
+                        model=MODEL_CONFIG['sentiment_model']
+                    )
+                    warmed_up = self._compile_model(self.sentiment_model)
+                # One dummy pass so runtime setup (ONNX session, kernel
+                # selection, buffers) happens here, not on the first request;
+                # a compiled model already had its pass in _compile_model
+                if not warmed_up:
+                    try:
+                        self.sentiment_model("warmup", truncation=True)
+                    except Exception as e:
+                        logger.warning(f"Sentiment model warm-up failed: {str(e)}")
                 logger.info("Initialized transformer-based sentiment analyzer")
             else:
                 raise ImportError("Using fallback sentiment analyzer")
                 
         except Exception as e:
             logger.warning(f"Failed to load transformer model: {str(e)}")
-            logger.info("Using TextBlob for sentiment analysis instead")
+            logger.info("Using VADER for sentiment analysis instead")
             self.use_transformers = False
             self.sentiment_model = None
 
+    @staticmethod
+    def _load_onnx_pipeline():
+        """
+        Build a pipeline over a dynamically INT8-quantized ONNX export.
+        
+        The quantized model is written to MODEL_CONFIG['onnx_dir'] the first
+        time and loaded from there afterwards.
+        
+        Returns:
+            The pipeline, or None if optimum/onnxruntime are unavailable or
+            the export fails, in which case the PyTorch model is used
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer
+        except ImportError:
+            return None
+
+        model_id = MODEL_CONFIG['sentiment_model']
+        onnx_dir = MODEL_CONFIG['onnx_dir']
+        try:
+            if not os.path.isfile(os.path.join(onnx_dir, "model_quantized.onnx")):
+                model = ORTModelForSequenceClassification.from_pretrained(
+                    model_id, export=True
+                )
+                qconfig = AutoQuantizationConfig.avx512_vnni(
+                    is_static=False, per_channel=True
+                )
+                ORTQuantizer.from_pretrained(model).quantize(
+                    save_dir=onnx_dir, quantization_config=qconfig
+                )
+                AutoTokenizer.from_pretrained(model_id).save_pretrained(onnx_dir)
+
+            pipe = pipeline(
+                "sentiment-analysis",
+                model=ORTModelForSequenceClassification.from_pretrained(
+                    onnx_dir, file_name="model_quantized.onnx"
+                ),
+                tokenizer=AutoTokenizer.from_pretrained(onnx_dir)
+            )
+            logger.info("Using INT8 ONNX Runtime sentiment model")
+            return pipe
+            
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX sentiment model: {str(e)}")
+            return None
+
+    @staticmethod
+    def _compile_model(pipe):
+        """
+        Wrap a PyTorch pipeline's model with torch.compile, in place.
+        
+        The inner model is compiled rather than the pipeline itself, and a
+        warm-up call triggers compilation immediately so failures surface
+        here instead of on the first request.
+        
+        Args:
+            pipe: Transformers pipeline backed by a PyTorch model
+            
+        Returns:
+            True if the model was compiled (and so already warmed up)
+        """
+        if not MODEL_CONFIG['torch_compile']:
+            return False
+
+        try:
+            import torch
+            model = pipe.model
+            if not hasattr(torch, 'compile') or not isinstance(model, torch.nn.Module):
+                return False
+
+            pipe.model = torch.compile(model, mode="reduce-overhead", fullgraph=False)
+            try:
+                pipe("warmup", truncation=True)
+            except Exception:
+                pipe.model = model
+                raise
+            logger.info("Compiled sentiment model with torch.compile")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"torch.compile unavailable: {str(e)}")
+            return False
+
     def analyze_text(self, text: str) -> Dict[str, Union[str, float]]:
         """
         Analyze sentiment of a single text.
@@ -44,30 +163,30 @@ class SentimentAnalyzer:
         Returns:
             Dictionary containing sentiment label and score
         """
-        if pd.isna(text) or text.strip() == "":
+        if not isinstance(text, str) or not text.strip():
             return {'label': 'neutral', 'score': 0.5}
             
         try:
             if self.use_transformers:
-                result = self.sentiment_model(text)[0]
-                return result
+                with self._result_cache_lock:
+                    cached = self._result_cache.get(text)
+                if cached is None:
+                    with self._model_lock:
+                        cached = self.sentiment_model(text, truncation=True)[0]
+                    cached['label'] = _LABEL_MAP.get(cached['label'], cached['label'])
+                    with self._result_cache_lock:
+                        self._result_cache[text] = cached
+                return dict(cached)
             else:
-                # Fallback to TextBlob
-                analysis = TextBlob(text)
-                polarity = analysis.sentiment.polarity
-                
-                # Convert TextBlob polarity to categorical sentiment
-                if polarity > 0.1:
-                    label = 'positive'
-                    score = min(0.5 + polarity, 1.0)
-                elif polarity < -0.1:
-                    label = 'negative'
-                    score = max(0.5 - abs(polarity), 0.0)
-                else:
-                    label = 'neutral'
-                    score = 0.5
+                # Fallback to the VADER lexicon
+                compound = self._vader.polarity_scores(text)['compound']
                 
-                return {'label': label, 'score': score}
+                # Map compound polarity in [-1, 1] onto a [0, 1] score
+                if compound > 0.05:
+                    return {'label': 'positive', 'score': 0.5 + compound / 2}
+                if compound < -0.05:
+                    return {'label': 'negative', 'score': 0.5 + compound / 2}
+                return {'label': 'neutral', 'score': 0.5}
                 
         except Exception as e:
             logger.error(f"Error analyzing text: {str(e)}")
@@ -75,18 +194,64 @@ class SentimentAnalyzer:
 
     def analyze_texts_batch(
         self, 
-        texts: List[str]
+        texts: List[str],
+        batch_size: Optional[int] = None
     ) -> List[Dict[str, Union[str, float]]]:
         """
         Analyze sentiment of multiple texts.
         
+        With the transformer model, distinct non-empty texts are scored once
+        each, sorted by length and batched so each batch pads only to its own
+        longest text; duplicates, and texts scored by earlier calls, reuse
+        the cached result. Empty or non-string
+        entries (None, NaN) are neutral without reaching the model.
+        Inputs are truncated to the tokenizer's maximum length. Results are
+        returned in the original order.
+        
         Args:
             texts: List of texts to analyze
+            batch_size: Texts per model call (defaults to MODEL_CONFIG['batch_size'])
             
         Returns:
             List of sentiment dictionaries
         """
-        return [self.analyze_text(text) for text in texts]
+        texts = list(texts)
+        if not self.use_transformers:
+            return [self.analyze_text(text) for text in texts]
+
+        # Score each distinct non-empty text once, shortest first, reusing
+        # results cached by earlier calls
+        lookup = {}
+        with self._result_cache_lock:
+            for text in texts:
+                if isinstance(text, str) and text.strip() and text not in lookup:
+                    lookup[text] = self._result_cache.get(text)
+        unique = sorted(
+            (text for text, result in lookup.items() if result is None),
+            key=len
+        )
+
+        try:
+            if unique:
+                with self._model_lock:
+                    outputs = self.sentiment_model(
+                        unique,
+                        batch_size=batch_size or MODEL_CONFIG['batch_size'],
+                        truncation=True
+                    )
+                with self._result_cache_lock:
+                    for text, result in zip(unique, outputs):
+                        result['label'] = _LABEL_MAP.get(result['label'], result['label'])
+                        lookup[text] = self._result_cache[text] = result
+            return [
+                dict(lookup[text]) if text in lookup
+                else {'label': 'neutral', 'score': 0.5}
+                for text in texts
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error analyzing text batch: {str(e)}")
+            return [self.analyze_text(text) for text in texts]
 
     def get_sentiment_stats(
         self, 
@@ -103,33 +268,36 @@ class SentimentAnalyzer:
         Returns:
             Dictionary of sentiment statistics
         """
+        empty_stats = {
+            'positive_ratio': 0,
+            'negative_ratio': 0,
+            'neutral_ratio': 0,
+            'average_score': 0.5,
+            'score_std': 0
+        }
         try:
             sentiments = self.analyze_texts_batch(df[text_column].tolist())
+            n = len(sentiments)
+            if n == 0:
+                return empty_stats
             
-            # Calculate statistics
-            sentiment_df = pd.DataFrame(sentiments)
+            # Calculate statistics straight from the result dicts: one
+            # unsorted counting pass over the labels, then numpy reductions
+            counts = Counter(s['label'] for s in sentiments)
+            scores = np.fromiter(
+                (s['score'] for s in sentiments), dtype=np.float32, count=n
+            )
             stats = {
-                'positive_ratio': (
-                    sentiment_df['label'] == 'positive'
-                ).mean(),
-                'negative_ratio': (
-                    sentiment_df['label'] == 'negative'
-                ).mean(),
-                'neutral_ratio': (
-                    sentiment_df['label'] == 'neutral'
-                ).mean(),
-                'average_score': sentiment_df['score'].mean(),
-                'score_std': sentiment_df['score'].std()
+                'positive_ratio': counts.get('positive', 0) / n,
+                'negative_ratio': counts.get('negative', 0) / n,
+                'neutral_ratio': counts.get('neutral', 0) / n,
+                'average_score': float(scores.mean()),
+                # Sample std, as pandas; NaN for a single result
+                'score_std': float(scores.std(ddof=1)) if n > 1 else float('nan')
             }
             
             return stats
             
         except Exception as e:
             logger.error(f"Error calculating sentiment stats: {str(e)}")
-            return {
-                'positive_ratio': 0,
-                'negative_ratio': 0,
-                'neutral_ratio': 0,
-                'average_score': 0.5,
-                'score_std': 0
-            }
\ No newline at end of file
+            return empty_stats
\ No newline at end of file
@@ -3,11 +3,24 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Optional, Tuple
 import logging
+import os
+import re
+import threading
+import time
 from datetime import datetime, timedelta
-from functools import lru_cache
+from cachetools import LRUCache
+from .config import DATA_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Columns kept for every history, whichever yfinance call produced it
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# Histories already decoded from the disk cache, keyed by (path, mtime) so a
+# rewritten file is never served stale
+_FRAME_CACHE = LRUCache(maxsize=64)
+_FRAME_CACHE_LOCK = threading.Lock()
+
 class StockDataAnalyzer:
     """
     A class for fetching and analyzing stock market data.
@@ -17,7 +30,23 @@ class StockDataAnalyzer:
         """Initialize the stock analyzer."""
         pass
 
-    @lru_cache(maxsize=100)
+    @staticmethod
+    def _cache_path(symbol: str, period: str, interval: str) -> str:
+        """Build the on-disk cache path for a price history request."""
+        # yfinance treats symbols case-insensitively, so the cache does too
+        safe_symbol = re.sub(r'[^\w.-]', '_', symbol.upper())
+        return os.path.join(
+            DATA_CONFIG['stock_cache_dir'],
+            f"{safe_symbol}_{period}_{interval}.parquet"
+        )
+
+    @staticmethod
+    def _cache_ttl(interval: str) -> int:
+        """Seconds a cached history stays fresh for the given bar interval."""
+        if interval.endswith(('m', 'h')) and not interval.endswith('mo'):
+            return DATA_CONFIG['stock_cache_ttl_intraday']
+        return DATA_CONFIG['stock_cache_ttl_daily']
+
     def get_stock_data(
         self, 
         symbol: str, 
@@ -25,7 +54,11 @@ class StockDataAnalyzer:
         interval: str = "1d"
     ) -> pd.DataFrame:
         """
-        Fetch stock data using yfinance.
+        Fetch stock data using yfinance, with a TTL cache on disk.
+        
+        Histories are stored as parquet keyed by (symbol, period, interval),
+        so warm restarts skip the Yahoo request. Each call returns a fresh
+        DataFrame, so callers cannot corrupt the cache.
         
         Args:
             symbol: Stock symbol
@@ -35,6 +68,11 @@ class StockDataAnalyzer:
         Returns:
             DataFrame containing stock data
         """
+        cached = self._load_from_cache(symbol, period, interval)
+        if cached is not None:
+            return cached
+
+        path = self._cache_path(symbol, period, interval)
         try:
             stock = yf.Ticker(symbol)
             df = stock.history(period=period, interval=interval)
@@ -44,12 +82,139 @@ class StockDataAnalyzer:
                 return pd.DataFrame()
                 
             logger.info(f"Successfully fetched stock data for {symbol}")
+            df = self._normalize_history(df)
+            self._save_to_cache(path, df)
             return df
             
         except Exception as e:
             logger.error(f"Error fetching stock data for {symbol}: {str(e)}")
             return pd.DataFrame()
 
+    def get_multi_stock_data(
+        self,
+        symbols: Tuple[str, ...],
+        period: str = "1mo",
+        interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch several stocks, downloading all uncached ones in one request.
+        
+        Shares the per-symbol disk cache with get_stock_data, so symbols
+        fetched either way are reused by both.
+        
+        Args:
+            symbols: Stock symbols
+            period: Time period to fetch
+            interval: Data interval
+            
+        Returns:
+            Mapping of symbol to its DataFrame (empty if no data was found)
+        """
+        data = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            cached = self._load_from_cache(symbol, period, interval)
+            if cached is not None:
+                data[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        if missing:
+            try:
+                # One request for all symbols; yfinance's default
+                # threads=True already fetches them in parallel
+                raw = yf.download(
+                    missing,
+                    period=period,
+                    interval=interval,
+                    group_by='ticker',
+                    progress=False
+                )
+            except Exception as e:
+                logger.error(f"Error downloading stock data for {missing}: {str(e)}")
+                raw = pd.DataFrame()
+
+            for symbol in missing:
+                if isinstance(raw.columns, pd.MultiIndex):
+                    # yfinance reports tickers uppercased
+                    ticker = symbol.upper()
+                    if ticker in raw.columns.get_level_values(0):
+                        df = raw[ticker].dropna(how='all')
+                    else:
+                        df = pd.DataFrame()
+                else:
+                    df = raw
+
+                if df.empty:
+                    logger.warning(f"No data found for symbol {symbol}")
+                    data[symbol] = pd.DataFrame()
+                    continue
+
+                df = self._normalize_history(df)
+                self._save_to_cache(self._cache_path(symbol, period, interval), df)
+                data[symbol] = df
+
+        return data
+
+    @staticmethod
+    def _normalize_history(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Bring a history into the shape shared by both fetch paths.
+        
+        Ticker.history returns a tz-aware index plus Dividends/Stock Splits,
+        while yf.download returns a tz-naive index without them. Both are
+        cached under the same key, so histories keep only PRICE_COLUMNS and
+        a tz-naive index in exchange-local time, letting them align.
+        
+        Args:
+            df: History from yfinance
+            
+        Returns:
+            Normalized DataFrame
+        """
+        df = df[[col for col in PRICE_COLUMNS if col in df.columns]]
+        if isinstance(df.index, pd.DatetimeIndex) and df.index.tz is not None:
+            df = df.tz_localize(None)
+        return df
+
+    def _load_from_cache(
+        self,
+        symbol: str,
+        period: str,
+        interval: str
+    ) -> Optional[pd.DataFrame]:
+        """Return a fresh cached history, or None if absent or expired."""
+        path = self._cache_path(symbol, period, interval)
+        try:
+            mtime = os.path.getmtime(path)
+            if time.time() - mtime >= self._cache_ttl(interval):
+                return None
+
+            key = (path, mtime)
+            with _FRAME_CACHE_LOCK:
+                df = _FRAME_CACHE.get(key)
+            if df is None:
+                df = pd.read_parquet(path)
+                with _FRAME_CACHE_LOCK:
+                    _FRAME_CACHE[key] = df
+            return df.copy()
+        except OSError:
+            pass  # Not cached yet
+        except Exception as e:
+            logger.error(f"Error reading stock cache {path}: {str(e)}")
+        return None
+
+    @staticmethod
+    def _save_to_cache(path: str, df: pd.DataFrame) -> None:
+        """Persist a fetched history; failures only cost a refetch later."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.to_parquet(path)
+            with _FRAME_CACHE_LOCK:
+                _FRAME_CACHE[(path, os.path.getmtime(path))] = df.copy()
+        except Exception as e:
+            logger.error(f"Error writing stock cache {path}: {str(e)}")
+
     def calculate_metrics(
         self, 
         df: pd.DataFrame
@@ -67,13 +232,20 @@ class StockDataAnalyzer:
             return {}
             
         try:
+            # Daily returns computed once on the raw array; the first day has
+            # no prior close
+            close = df['Close'].to_numpy(dtype=np.float64)
+            returns = np.empty_like(close)
+            returns[0] = np.nan
+            np.divide(close[1:], close[:-1], out=returns[1:])
+            returns[1:] -= 1.0
+            
             metrics = {
-                'daily_returns': df['Close'].pct_change(),
-                'volatility': df['Close'].pct_change().std() * np.sqrt(252),
-                'avg_volume': df['Volume'].mean(),
-                'price_change': (
-                    df['Close'].iloc[-1] - df['Close'].iloc[0]
-                ) / df['Close'].iloc[0]
+                'daily_returns': pd.Series(returns, index=df.index, name='Close'),
+                # Annualized sample standard deviation of daily returns
+                'volatility': float(np.nanstd(returns, ddof=1) * np.sqrt(252)),
+                'avg_volume': float(np.nanmean(df['Volume'].to_numpy(dtype=float))),
+                'price_change': float((close[-1] - close[0]) / close[0])
             }
             
             return metrics
@@ -100,8 +272,8 @@ class StockDataAnalyzer:
             Correlation coefficient
         """
         try:
-            df1 = self.get_stock_data(symbol1, period)
-            df2 = self.get_stock_data(symbol2, period)
+            data = self.get_multi_stock_data((symbol1, symbol2), period)
+            df1, df2 = data[symbol1], data[symbol2]
             
             if df1.empty or df2.empty:
                 return 0.0
@@ -4,62 +4,91 @@ import numpy as np
 from typing import Dict, List, Union
 import logging
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter
 import re
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Text cleaning patterns, compiled once
+_URL_RE = re.compile(r'http\S+|www\S+|https\S+')
+_NONWORD_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+
+# Ordered weekday categories for the day_of_week column
+DAY_OF_WEEK_DTYPE = pd.CategoricalDtype(
+    ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
+    ordered=True
+)
+
+# Words never reported as trending topics
+_STOP_WORDS = frozenset(['the', 'and', 'is', 'in', 'to', 'a', 'for'])
+
+# Feature extraction patterns, compiled once
+_MENTION_RE = re.compile(r'@(\w+)')
+# $-prefixed tickers like $AAPL or $amd, or bare uppercase ones like AAPL,
+# matched in a single scan
+_TICKER_RE = re.compile(r'(?<=\$)[A-Za-z]{1,5}|\b[A-Z]{2,5}\b')
+
 class TextPreprocessor:
     """Utility class for text preprocessing."""
     
     @staticmethod
     def clean_text(text: str) -> str:
-        """Clean and normalize text."""
-        if pd.isna(text):
-            return ""
-            
-        try:
-            # Convert to lowercase
-            text = text.lower()
-            
-            # Remove URLs
-            text = re.sub(r'http\S+|www\S+|https\S+', '', text)
-            
-            # Remove special characters
-            text = re.sub(r'[^\w\s]', '', text)
-            
-            # Remove extra whitespace
-            text = ' '.join(text.split())
-            
-            return text
-            
-        except Exception as e:
-            logger.error(f"Error cleaning text: {str(e)}")
-            return ""
+        """Clean and normalize text.
+
+        Expects a string; fill missing values before calling (``clean_series``
+        does this for whole columns).
+        """
+        # Convert to lowercase
+        text = text.lower()
+        
+        # Remove URLs
+        text = _URL_RE.sub('', text)
+        
+        # Remove special characters
+        text = _NONWORD_RE.sub('', text)
+        
+        # Remove extra whitespace
+        return _WS_RE.sub(' ', text).strip()
+
+    @staticmethod
+    def clean_series(texts: pd.Series) -> pd.Series:
+        """Clean and normalize a Series of texts with vectorized string ops."""
+        return (
+            texts.fillna('')
+            .str.lower()
+            .str.replace(_URL_RE, '', regex=True)
+            .str.replace(_NONWORD_RE, '', regex=True)
+            .str.replace(_WS_RE, ' ', regex=True)
+            .str.strip()
+        )
 
     @staticmethod
     def extract_mentions(text: str) -> List[str]:
         """Extract user mentions from text."""
-        try:
-            mentions = re.findall(r'@(\w+)', text)
-            return list(set(mentions))
-        except Exception as e:
-            logger.error(f"Error extracting mentions: {str(e)}")
-            return []
+        mentions = _MENTION_RE.findall(text)
+        return list(set(mentions))
+
+    @staticmethod
+    def extract_mentions_series(texts: pd.Series) -> pd.Series:
+        """Extract unique user mentions from each text in a Series."""
+        return texts.fillna('').str.findall(_MENTION_RE).map(
+            lambda mentions: list(dict.fromkeys(mentions))
+        )
 
     # src/utils.py (continued)
     @staticmethod
     def extract_tickers(text: str) -> List[str]:
         """Extract stock tickers from text."""
-        try:
-            # Match patterns like $AAPL or $AMD
-            tickers = re.findall(r'\$([A-Za-z]{1,5})', text)
-            # Also match common patterns without $ like "AAPL"
-            tickers.extend(re.findall(r'\b([A-Z]{2,5})\b', text))
-            return list(set(tickers))
-        except Exception as e:
-            logger.error(f"Error extracting tickers: {str(e)}")
-            return []
+        return list(set(_TICKER_RE.findall(text)))
+
+    @staticmethod
+    def extract_tickers_series(texts: pd.Series) -> pd.Series:
+        """Extract unique stock tickers from each text in a Series."""
+        return texts.fillna('').str.findall(_TICKER_RE).map(
+            lambda found: list(dict.fromkeys(found))
+        )
 
 class DataProcessor:
     """Utility class for data processing and analysis."""
@@ -68,15 +97,23 @@ class DataProcessor:
     def calculate_engagement_metrics(df: pd.DataFrame) -> pd.DataFrame:
         """Calculate engagement metrics for posts."""
         try:
-            df['engagement_score'] = (
-                df['score'] * 1.0 + 
-                df['num_comments'] * 2.0
-            ) * df['upvote_ratio']
+            # (score + 2 * num_comments) * upvote_ratio, computed in place
+            # on one buffer instead of allocating a Series per operation
+            engagement = df['num_comments'].to_numpy(dtype=np.float64, copy=True)
+            engagement *= 2.0
+            engagement += df['score'].to_numpy()
+            engagement *= df['upvote_ratio'].to_numpy()
             
-            df['hour_of_day'] = df['created_utc'].dt.hour
-            df['day_of_week'] = df['created_utc'].dt.day_name()
-            
-            return df
+            # dayofweek numbers Monday as 0, matching the category order, so
+            # the codes are used directly instead of formatting day names
+            # (missing timestamps become code -1, i.e. NaN)
+            created = df['created_utc'].dt
+            day_codes = created.dayofweek.fillna(-1).to_numpy(dtype=np.int8)
+            return df.assign(
+                engagement_score=engagement,
+                hour_of_day=created.hour.to_numpy(),
+                day_of_week=pd.Categorical.from_codes(day_codes, dtype=DAY_OF_WEEK_DTYPE)
+            )
         except Exception as e:
             logger.error(f"Error calculating engagement metrics: {str(e)}")
             return df
@@ -100,53 +137,47 @@ class DataProcessor:
             # Combine all texts
             combined_text = ' '.join(texts)
             
-            # Remove common words and special characters
-            stop_words = set(['the', 'and', 'is', 'in', 'to', 'a', 'for'])
-            words = combined_text.lower().split()
-            words = [w for w in words if w not in stop_words and len(w) > 2]
-            
-            # Count occurrences
-            word_counts = defaultdict(int)
-            for word in words:
-                word_counts[word] += 1
+            # Count words, skipping common words and short tokens
+            word_counts = Counter(
+                w for w in combined_text.lower().split()
+                if len(w) > 2 and w not in _STOP_WORDS
+            )
             
-            # Filter trending topics
-            trending = [
+            # Filter trending topics, most frequent first
+            return [
                 {'topic': word, 'count': count}
-                for word, count in word_counts.items()
+                for word, count in word_counts.most_common()
                 if count >= min_count
             ]
             
-            return sorted(trending, key=lambda x: x['count'], reverse=True)
-            
         except Exception as e:
             logger.error(f"Error identifying trending topics: {str(e)}")
             return []
 
 class CacheManager:
-    """Utility class for managing data caching."""
+    """Utility class for managing data caching.
+
+    Backed by a cachetools TTLCache, which expires entries lazily against a
+    monotonic clock and evicts the least recently used entry once
+    ``max_size`` is reached.
+    """
     
-    def __init__(self, cache_duration: int = 3600):
-        self.cache = {}
-        self.cache_times = {}
+    def __init__(self, cache_duration: int = 3600, max_size: int = 10_000):
         self.cache_duration = cache_duration
+        self.cache = TTLCache(maxsize=max_size, ttl=cache_duration)
 
     def get(self, key: str) -> Union[None, any]:
         """Get value from cache if not expired."""
         try:
-            if key in self.cache_times:
-                if (datetime.now() - self.cache_times[key]).seconds < self.cache_duration:
-                    return self.cache.get(key)
-            return None
+            return self.cache.get(key)
         except Exception as e:
             logger.error(f"Error retrieving from cache: {str(e)}")
             return None
 
     def set(self, key: str, value: any) -> None:
-        """Set value in cache with current timestamp."""
+        """Set value in cache; it expires after cache_duration seconds."""
         try:
             self.cache[key] = value
-            self.cache_times[key] = datetime.now()
         except Exception as e:
             logger.error(f"Error setting cache: {str(e)}")
 
@@ -175,12 +206,18 @@ class MetricsCalculator:
                 'weekly': {}
             }
             
-            df['hour'] = df[timestamp_col].dt.hour
-            df['day'] = df[timestamp_col].dt.day_name()
-            df['week'] = df[timestamp_col].dt.isocalendar().week
+            # Reuse the hour/day columns from calculate_engagement_metrics
+            # when they were derived from the same timestamps
+            if (timestamp_col == 'created_utc'
+                    and {'hour_of_day', 'day_of_week'}.issubset(df.columns)):
+                hours = df['hour_of_day']
+                days = df['day_of_week']
+            else:
+                hours = df[timestamp_col].dt.hour
+                days = df[timestamp_col].dt.day_name()
             
-            # Hourly metrics
-            hourly_counts = df.groupby('hour').size()
+            # Hourly metrics (sorted so ties resolve to the earliest hour)
+            hourly_counts = hours.value_counts(sort=False).sort_index()
             metrics['hourly'] = {
                 'peak_hour': hourly_counts.idxmax(),
                 'low_hour': hourly_counts.idxmin(),
@@ -188,7 +225,12 @@ class MetricsCalculator:
             }
             
             # Daily metrics
-            daily_counts = df.groupby('day').size()
+            daily_counts = days.value_counts(sort=False)
+            # Categorical days also count absent categories; drop those and
+            # key by plain names so ties resolve as before
+            daily_counts = daily_counts[daily_counts > 0]
+            daily_counts.index = daily_counts.index.astype(str)
+            daily_counts = daily_counts.sort_index()
             metrics['daily'] = {
                 'peak_day': daily_counts.idxmax(),
                 'low_day': daily_counts.idxmin(),
@@ -204,26 +246,29 @@ class MetricsCalculator:
 class DataValidator:
     """Utility class for data validation."""
     
+    _REQUIRED_COLUMNS = frozenset([
+        'title', 'text', 'score', 'created_utc', 
+        'num_comments', 'upvote_ratio'
+    ])
+    
     @staticmethod
     def validate_reddit_data(df: pd.DataFrame) -> bool:
         """
         Validate Reddit data structure.
         
+        Checks run cheapest first (columns, dtypes, then the null scan).
+        
         Args:
             df: DataFrame to validate
             
         Returns:
             Boolean indicating if data is valid
         """
-        required_columns = [
-            'title', 'text', 'score', 'created_utc', 
-            'num_comments', 'upvote_ratio'
-        ]
-        
         try:
             # Check required columns
-            if not all(col in df.columns for col in required_columns):
-                logger.error("Missing required columns in DataFrame")
+            missing = DataValidator._REQUIRED_COLUMNS.difference(df.columns)
+            if missing:
+                logger.error(f"Missing required columns: {sorted(missing)}")
                 return False
             
             # Check data types
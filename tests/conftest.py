@@ -1,7 +1,29 @@
+import os
 import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from filelock import FileLock
+from src.config import DATA_CONFIG
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dirs(tmp_path, monkeypatch):
+    """Point on-disk caches at a per-test directory."""
+    monkeypatch.setitem(DATA_CONFIG, 'cache_dir', str(tmp_path / 'cache'))
+    monkeypatch.setitem(DATA_CONFIG, 'stock_cache_dir', str(tmp_path / 'stocks'))
+
+@pytest.fixture(scope="session")
+def shared_sentiment_analyzer(tmp_path_factory):
+    """Session-wide analyzer, the same instance RedditDataProcessor defaults to."""
+    from src.data_processor import _get_default_analyzer
+    if os.environ.get('PYTEST_XDIST_WORKER') is None:
+        return _get_default_analyzer()
+    
+    # xdist workers share the parent of their temp dirs; hold a lock there so
+    # only one worker downloads the model weights at a time
+    lock_path = tmp_path_factory.getbasetemp().parent / 'sentiment_model.lock'
+    with FileLock(str(lock_path)):
+        return _get_default_analyzer()
 
 @pytest.fixture
 def sample_reddit_data():
@@ -1,8 +1,13 @@
 import pytest
 import streamlit as st
-from app.dashboard import ModernRedditDashboard
+import os
+from app.dashboard import (
+    ModernRedditDashboard, _topic_masks, _disk_cache_path,
+    _save_disk_cache, _load_disk_cache, _export_csv
+)
 import pandas as pd
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 class TestDashboardFunctionality:
     """Test all dashboard components systematically."""
@@ -74,15 +79,19 @@ class TestDashboardFunctionality:
             st.session_state['post_limit'] = 10
             
             subreddits = [s.strip() for s in st.session_state['subreddits'].split('\n')]
-            all_data = []
             
-            for subreddit in subreddits:
-                df = dashboard.reddit_collector.fetch_subreddit_data(
-                    subreddit,
-                    st.session_state['post_limit']
-                )
+            # Fetches are network-bound, so run them concurrently
+            with ThreadPoolExecutor(max_workers=min(8, len(subreddits))) as executor:
+                all_data = list(executor.map(
+                    lambda s: dashboard.reddit_collector.fetch_subreddit_data(
+                        s,
+                        st.session_state['post_limit']
+                    ),
+                    subreddits
+                ))
+            
+            for subreddit, df in zip(subreddits, all_data):
                 assert isinstance(df, pd.DataFrame), f"Failed to fetch data for {subreddit}"
-                all_data.append(df)
             
             assert len(all_data) > 0, "No data fetched for any subreddit"
             print("✓ Comparative Analysis working correctly")
@@ -129,6 +138,39 @@ class TestDashboardFunctionality:
             print(f"✗ Visualization Data Error: {str(e)}")
             return False
 
+def test_topic_masks_overlapping_topics():
+    """Test overlapping topics each match a post that mentions both."""
+    combined_lc = pd.Series([
+        'openai ships a new model',
+        'tesla deliveries beat estimates',
+        'nothing relevant here'
+    ])
+    
+    masks = _topic_masks(combined_lc, ['AI', 'OpenAI', 'Tesla', 'la'])
+    
+    assert list(masks) == ['ai', 'openai', 'tesla', 'la']
+    assert masks['ai'].tolist() == [True, False, False]
+    assert masks['openai'].tolist() == [True, False, False]
+    assert masks['tesla'].tolist() == [False, True, False]
+    assert masks['la'].tolist() == [False, True, False]
+
+def test_disk_cache_round_trip(sample_reddit_data):
+    """Test a disk-cache hit exports the same CSV as the original frame."""
+    df = sample_reddit_data.assign(
+        url='https://reddit.com',
+        tickers=[['AAPL'], ['GME', 'AMC'], []],
+        mentions=[[], ['wallstreetbets'], []]
+    )
+    path = _disk_cache_path('stocks', 3, 'day')
+    
+    _save_disk_cache(path, df, {'total_posts': 3})
+    loaded_df, insights = _load_disk_cache(path)
+    
+    assert insights == {'total_posts': 3}
+    assert loaded_df['tickers'].tolist() == [['AAPL'], ['GME', 'AMC'], []]
+    assert _export_csv(loaded_df) == _export_csv(df)
+    assert not [n for n in os.listdir(os.path.dirname(path)) if n.endswith('.tmp')]
+
 def run_all_tests():
     """Run all dashboard tests and generate report."""
     print("Starting Dashboard Functionality Tests...")
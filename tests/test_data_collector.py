@@ -3,6 +3,8 @@ import pytest
 from src.data_collector import RedditDataCollector
 from prawcore.exceptions import PrawcoreException
 
+pytestmark = pytest.mark.xdist_group("reddit")
+
 def test_reddit_data_collector_initialization():
     """Test Reddit data collector initialization."""
     collector = RedditDataCollector()
@@ -41,3 +43,22 @@ def test_error_handling(mocker):
     with pytest.raises(PrawcoreException):
         collector.fetch_subreddit_data('test')
 
+
+def test_fetch_subreddit_data_cached(mocker, mock_reddit_response):
+    """Test repeated fetches are served from the TTL cache as copies."""
+    collector = RedditDataCollector()
+    
+    mock_subreddit = mocker.Mock()
+    mock_subreddit.hot.return_value = mock_reddit_response
+    mocker.patch.object(
+        collector.reddit,
+        'subreddit',
+        return_value=mock_subreddit
+    )
+    
+    first = collector.fetch_subreddit_data('test', limit=1)
+    first['score'] = 0
+    second = collector.fetch_subreddit_data('test', limit=1)
+    
+    assert mock_subreddit.hot.call_count == 1
+    assert second['score'].iloc[0] == 100
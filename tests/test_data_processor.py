@@ -1,13 +1,20 @@
 # tests/test_data_processor.py
 import pytest
+import pandas as pd
 from src.data_processor import RedditDataProcessor
 
+pytestmark = pytest.mark.xdist_group("sentiment")
+
 def test_data_processor_initialization():
     """Test data processor initialization."""
     processor = RedditDataProcessor()
     assert processor is not None
     assert processor.sentiment_analyzer is not None
 
+def test_default_sentiment_analyzer_shared():
+    """Test processors without an explicit analyzer share one instance."""
+    assert RedditDataProcessor().sentiment_analyzer is RedditDataProcessor().sentiment_analyzer
+
 def test_process_reddit_data(sample_reddit_data):
     """Test Reddit data processing."""
     processor = RedditDataProcessor()
@@ -38,3 +45,17 @@ def test_calculate_insights(sample_reddit_data):
     assert 'sentiment_distribution' in insights
 
 
+def test_calculate_ticker_sentiment():
+    """Test per-ticker sentiment counts and ratios."""
+    processor = RedditDataProcessor()
+    df = pd.DataFrame({
+        'tickers': [['AAPL', 'TSLA'], [], ['AAPL']],
+        'sentiment': ['positive', 'neutral', 'negative']
+    })
+    
+    result = processor._calculate_ticker_sentiment(df)
+    
+    assert set(result) == {'AAPL', 'TSLA'}
+    assert result['AAPL']['total_mentions'] == 2
+    assert result['AAPL']['positive_ratio'] == 0.5
+    assert result['TSLA']['neutral'] == 0
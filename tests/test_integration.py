@@ -4,6 +4,8 @@ from src.data_collector import RedditDataCollector
 from src.sentiment_analyzer import SentimentAnalyzer
 from src.data_processor import RedditDataProcessor
 
+pytestmark = pytest.mark.xdist_group("sentiment")
+
 def test_end_to_end_flow(mocker, sample_reddit_data, mock_reddit_response):
     """Test complete data flow from collection to processing."""
     # Setup
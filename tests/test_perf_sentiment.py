@@ -0,0 +1,34 @@
+# tests/test_perf_sentiment.py
+"""Latency benchmark for batched sentiment analysis.
+
+Runs under the default serial ``pytest``; pytest-benchmark disables
+itself under xdist. Regressions are caught by comparing against a saved
+baseline, e.g. ``pytest tests/test_perf_sentiment.py --benchmark-autosave``
+then ``--benchmark-compare --benchmark-compare-fail=mean:10%``. Nothing
+runs that comparison automatically, so the 10% gate is only enforced when
+invoked by hand.
+"""
+import itertools
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.xdist_group("sentiment")
+
+@pytest.mark.benchmark(group="sentiment")
+def test_batch_latency(benchmark, shared_sentiment_analyzer):
+    """Benchmark scoring a 64-text batch through the model."""
+    rounds = itertools.count()
+
+    def setup():
+        # Texts unique to each round, so no round is served from cache
+        round_id = next(rounds)
+        return ([f"This stock will moon {round_id}-{i}" for i in range(64)],), {}
+
+    result = benchmark.pedantic(
+        shared_sentiment_analyzer.analyze_texts_batch,
+        setup=setup,
+        rounds=5
+    )
+    assert len(result) == 64
@@ -1,16 +1,22 @@
 # tests/test_sentiment_analyzer.py
 import pytest
+import numpy as np
+import pandas as pd
+import time
+from concurrent.futures import ThreadPoolExecutor
 from src.sentiment_analyzer import SentimentAnalyzer
 
-def test_sentiment_analyzer_initialization():
+pytestmark = pytest.mark.xdist_group("sentiment")
+
+def test_sentiment_analyzer_initialization(shared_sentiment_analyzer):
     """Test sentiment analyzer initialization."""
-    analyzer = SentimentAnalyzer()
+    analyzer = shared_sentiment_analyzer
     assert analyzer is not None
     assert analyzer.sentiment_model is not None
 
-def test_analyze_text():
+def test_analyze_text(shared_sentiment_analyzer):
     """Test single text sentiment analysis."""
-    analyzer = SentimentAnalyzer()
+    analyzer = shared_sentiment_analyzer
     result = analyzer.analyze_text("This is a great investment opportunity!")
     
     assert isinstance(result, dict)
@@ -18,9 +24,9 @@ def test_analyze_text():
     assert 'score' in result
     assert isinstance(result['score'], float)
 
-def test_analyze_texts_batch():
+def test_analyze_texts_batch(shared_sentiment_analyzer):
     """Test batch sentiment analysis."""
-    analyzer = SentimentAnalyzer()
+    analyzer = shared_sentiment_analyzer
     texts = [
         "Great investment!",
         "Terrible losses today",
@@ -31,10 +37,168 @@ def test_analyze_texts_batch():
     assert len(results) == len(texts)
     assert all('label' in r for r in results)
 
-def test_empty_text_handling():
+def test_empty_text_handling(shared_sentiment_analyzer):
     """Test handling of empty text."""
-    analyzer = SentimentAnalyzer()
+    analyzer = shared_sentiment_analyzer
     result = analyzer.analyze_text("")
     assert result['label'] == 'neutral'
     assert result['score'] == 0.5
 
+def test_analyze_text_truncates_long_input(mocker):
+    """Test single-text inference truncates to the model's maximum length."""
+    mocker.patch.dict('src.sentiment_analyzer.MODEL_CONFIG', use_onnx=False, torch_compile=False)
+    mock_pipeline = mocker.patch('src.sentiment_analyzer.pipeline')
+    mock_pipeline.return_value.return_value = [{'label': 'POS', 'score': 0.9}]
+    analyzer = SentimentAnalyzer()
+    
+    result = analyzer.analyze_text("word " * 2000)
+    
+    mock_pipeline.return_value.assert_called_with("word " * 2000, truncation=True)
+    assert result == {'label': 'positive', 'score': 0.9}
+
+def test_model_calls_serialized(mocker):
+    """Test concurrent callers never run the shared pipeline at once."""
+    mocker.patch.dict('src.sentiment_analyzer.MODEL_CONFIG', use_onnx=False, torch_compile=False)
+    mock_pipeline = mocker.patch('src.sentiment_analyzer.pipeline')
+    active, overlaps = [0], []
+    
+    def model(text, **kwargs):
+        active[0] += 1
+        overlaps.append(active[0] > 1)
+        time.sleep(0.01)
+        active[0] -= 1
+        return [{'label': 'POS', 'score': 0.9}]
+    
+    mock_pipeline.return_value.side_effect = model
+    analyzer = SentimentAnalyzer()
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(analyzer.analyze_text, [f"post {i}" for i in range(8)]))
+    
+    assert len(overlaps) == 9  # Warm-up plus one call per post
+    assert not any(overlaps)
+
+def test_fallback_sentiment_labels():
+    """Test the lexicon fallback labels clear positive and negative text."""
+    analyzer = SentimentAnalyzer(use_transformers=False)
+    
+    positive = analyzer.analyze_text("This is a great investment opportunity!")
+    negative = analyzer.analyze_text("Terrible losses, awful week")
+    
+    assert positive['label'] == 'positive' and positive['score'] > 0.5
+    assert negative['label'] == 'negative' and negative['score'] < 0.5
+
+
+def test_model_warmed_up_on_init(mocker):
+    """Test the loaded model gets a warm-up pass during construction."""
+    mocker.patch.dict('src.sentiment_analyzer.MODEL_CONFIG', use_onnx=False, torch_compile=False)
+    mock_pipeline = mocker.patch('src.sentiment_analyzer.pipeline')
+    
+    analyzer = SentimentAnalyzer()
+    
+    assert analyzer.use_transformers
+    mock_pipeline.return_value.assert_called_once_with("warmup", truncation=True)
+
+def test_compiled_model_warmed_up_once(mocker):
+    """Test a compiled model is not warmed up again after compilation."""
+    mocker.patch.dict('src.sentiment_analyzer.MODEL_CONFIG', use_onnx=False)
+    mock_pipeline = mocker.patch('src.sentiment_analyzer.pipeline')
+    mocker.patch.object(SentimentAnalyzer, '_compile_model', return_value=True)
+    
+    SentimentAnalyzer()
+    
+    mock_pipeline.return_value.assert_not_called()
+
+def test_get_sentiment_stats(mocker):
+    """Test label ratios and score statistics, including empty input."""
+    analyzer = SentimentAnalyzer(use_transformers=False)
+    mocker.patch.object(analyzer, 'analyze_texts_batch', return_value=[
+        {'label': 'positive', 'score': 0.9},
+        {'label': 'positive', 'score': 0.7},
+        {'label': 'negative', 'score': 0.2},
+        {'label': 'neutral', 'score': 0.5}
+    ])
+    
+    stats = analyzer.get_sentiment_stats(pd.DataFrame({'text': ['a', 'b', 'c', 'd']}), 'text')
+    assert stats['positive_ratio'] == 0.5
+    assert stats['negative_ratio'] == stats['neutral_ratio'] == 0.25
+    assert stats['average_score'] == pytest.approx(0.575)
+    assert stats['score_std'] == pytest.approx(pd.Series([0.9, 0.7, 0.2, 0.5]).std())
+    
+    analyzer.analyze_texts_batch.return_value = []
+    assert analyzer.get_sentiment_stats(pd.DataFrame({'text': []}), 'text')['average_score'] == 0.5
+    
+    analyzer.analyze_texts_batch.return_value = [{'label': 'positive', 'score': 0.9}]
+    single = analyzer.get_sentiment_stats(pd.DataFrame({'text': ['a']}), 'text')
+    assert single['average_score'] == pytest.approx(0.9)
+    assert np.isnan(single['score_std'])
+
+def test_analyze_texts_batch_single_model_call(mocker):
+    """Test batch analysis scores all non-empty texts in one model call."""
+    analyzer = SentimentAnalyzer(use_transformers=False)
+    analyzer.use_transformers = True
+    analyzer.sentiment_model = mocker.Mock(
+        side_effect=lambda texts, **kwargs: [
+            {'label': 'POS' if text == "Great!" else 'NEG', 'score': 0.9}
+            for text in texts
+        ]
+    )
+    
+    results = analyzer.analyze_texts_batch(["Great!", "", None, float('nan'), "Awful"])
+    
+    analyzer.sentiment_model.assert_called_once()
+    assert sorted(analyzer.sentiment_model.call_args[0][0]) == ["Awful", "Great!"]
+    assert [r['label'] for r in results] == [
+        'positive', 'neutral', 'neutral', 'neutral', 'negative'
+    ]
+
+def test_analyze_texts_batch_length_sorted(mocker):
+    """Test texts reach the model shortest first and results keep input order."""
+    analyzer = SentimentAnalyzer(use_transformers=False)
+    analyzer.use_transformers = True
+    analyzer.sentiment_model = mocker.Mock(
+        side_effect=lambda texts, **kwargs: [
+            {'label': 'POS' if text.startswith('good') else 'NEG', 'score': 0.9}
+            for text in texts
+        ]
+    )
+    
+    results = analyzer.analyze_texts_batch(["good and long text", "bad"], batch_size=8)
+    
+    assert analyzer.sentiment_model.call_args[0][0] == ["bad", "good and long text"]
+    assert analyzer.sentiment_model.call_args[1]['batch_size'] == 8
+    assert [r['label'] for r in results] == ['positive', 'negative']
+
+def test_analyze_texts_batch_deduplicates(mocker):
+    """Test repeated texts are scored once and every position gets a result."""
+    analyzer = SentimentAnalyzer(use_transformers=False)
+    analyzer.use_transformers = True
+    analyzer.sentiment_model = mocker.Mock(
+        side_effect=lambda texts, **kwargs: [{'label': 'POS', 'score': 0.9} for _ in texts]
+    )
+    
+    results = analyzer.analyze_texts_batch(["to the moon", "", "to the moon", "hold"])
+    
+    assert analyzer.sentiment_model.call_args[0][0] == ["hold", "to the moon"]
+    assert [r['label'] for r in results] == ['positive', 'neutral', 'positive', 'positive']
+    assert results[0] is not results[2]
+
+def test_sentiment_results_cached_across_calls(mocker):
+    """Test texts already scored are not sent to the model again."""
+    analyzer = SentimentAnalyzer(use_transformers=False)
+    analyzer.use_transformers = True
+    analyzer.sentiment_model = mocker.Mock(
+        side_effect=lambda texts, **kwargs: [
+            {'label': 'NEG', 'score': 0.8}
+            for _ in (texts if isinstance(texts, list) else [texts])
+        ]
+    )
+    
+    analyzer.analyze_texts_batch(["bag holder", "diamond hands"])
+    results = analyzer.analyze_texts_batch(["diamond hands", "paper hands"])
+    single = analyzer.analyze_text("bag holder")
+    
+    assert analyzer.sentiment_model.call_count == 2
+    assert analyzer.sentiment_model.call_args[0][0] == ["paper hands"]
+    assert [r['label'] for r in results] == ['negative', 'negative']
+    assert single == {'label': 'negative', 'score': 0.8}
@@ -4,39 +4,51 @@ import numpy as np
 from datetime import datetime, timedelta
 from src.stock_analyzer import StockDataAnalyzer
 
+pytestmark = pytest.mark.xdist_group("stock")
+
+# Built once and shared; tests must not modify these frames
+_CANONICAL_DF = pd.DataFrame({
+    'Open': [100, 101, 102, 101, 103],
+    'High': [102, 103, 104, 103, 105],
+    'Low': [99, 100, 101, 100, 102],
+    'Close': [101, 102, 103, 102, 104],
+    'Volume': [1000, 1100, 1200, 1100, 1300]
+}, index=pd.date_range(start='2024-01-01', periods=5, freq='D'))
+
+# Shaped like yf.download(['AAPL', 'MSFT'], group_by='ticker')
+_CANONICAL_MULTI_DF = pd.concat({
+    'AAPL': _CANONICAL_DF,
+    'MSFT': _CANONICAL_DF[::-1].set_axis(_CANONICAL_DF.index)
+}, axis=1)
+
 @pytest.fixture
 def sample_stock_data():
     """Fixture providing sample stock price data."""
-    dates = pd.date_range(start='2024-01-01', periods=5, freq='D')
-    return pd.DataFrame({
-        'Open': [100, 101, 102, 101, 103],
-        'High': [102, 103, 104, 103, 105],
-        'Low': [99, 100, 101, 100, 102],
-        'Close': [101, 102, 103, 102, 104],
-        'Volume': [1000, 1100, 1200, 1100, 1300]
-    }, index=dates)
+    return _CANONICAL_DF
+
+@pytest.fixture
+def patched_yf(mocker):
+    """Patch yfinance.Ticker so history() returns the canonical data."""
+    mock_ticker = mocker.Mock()
+    # Ticker.history returns an exchange-local, tz-aware index
+    mock_ticker.history.return_value = _CANONICAL_DF.tz_localize('America/New_York')
+    mocker.patch('yfinance.Ticker', return_value=mock_ticker)
+    return mock_ticker
+
+@pytest.fixture
+def patched_download(mocker):
+    """Patch yfinance.download to return canonical AAPL/MSFT data."""
+    return mocker.patch('yfinance.download', return_value=_CANONICAL_MULTI_DF)
 
 def test_stock_analyzer_initialization():
     """Test stock analyzer initialization."""
     analyzer = StockDataAnalyzer()
     assert analyzer is not None
 
-def test_get_stock_data(mocker):
+def test_get_stock_data(patched_yf):
     """Test fetching stock data."""
     analyzer = StockDataAnalyzer()
     
-    # Mock yfinance Ticker
-    mock_ticker = mocker.Mock()
-    mock_ticker.history.return_value = pd.DataFrame({
-        'Open': [100],
-        'High': [101],
-        'Low': [99],
-        'Close': [100.5],
-        'Volume': [1000]
-    })
-    
-    mocker.patch('yfinance.Ticker', return_value=mock_ticker)
-    
     df = analyzer.get_stock_data('AAPL', period='1d')
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
@@ -62,23 +74,24 @@ def test_calculate_metrics(sample_stock_data):
     ) / sample_stock_data['Close'].iloc[0]
     assert np.isclose(metrics['price_change'], expected_price_change)
 
-def test_analyze_correlation(mocker):
-    """Test correlation analysis between stocks."""
+def test_calculate_metrics_missing_volume(sample_stock_data):
+    """Test a missing volume bar is skipped rather than poisoning the average."""
     analyzer = StockDataAnalyzer()
+    df = sample_stock_data.copy()
+    df.loc[df.index[0], 'Volume'] = np.nan
     
-    # Create sample data for two stocks
-    sample_data = pd.DataFrame({
-        'Close': [100, 101, 102, 103, 104]
-    })
+    metrics = analyzer.calculate_metrics(df)
     
-    # Mock yfinance for both stocks
-    mock_ticker = mocker.Mock()
-    mock_ticker.history.return_value = sample_data
-    mocker.patch('yfinance.Ticker', return_value=mock_ticker)
+    assert metrics['avg_volume'] == pytest.approx(df['Volume'].mean())
+
+def test_analyze_correlation(patched_download):
+    """Test correlation analysis between stocks."""
+    analyzer = StockDataAnalyzer()
     
     correlation = analyzer.analyze_correlation('AAPL', 'MSFT', period='1w')
     assert isinstance(correlation, float)
     assert -1 <= correlation <= 1  # Correlation should be between -1 and 1
+    assert patched_download.call_count == 1  # Both stocks in one download
 
 def test_empty_data_handling():
     """Test handling of empty data."""
@@ -88,28 +101,69 @@ def test_empty_data_handling():
     metrics = analyzer.calculate_metrics(empty_df)
     assert metrics == {}  # Should return empty dict for empty data
 
-def test_error_handling(mocker):
+def test_error_handling(patched_yf):
     """Test error handling in stock analysis."""
     analyzer = StockDataAnalyzer()
     
-    # Mock yfinance to raise an exception
-    mock_ticker = mocker.Mock()
-    mock_ticker.history.side_effect = Exception("API Error")
-    mocker.patch('yfinance.Ticker', return_value=mock_ticker)
+    # Make yfinance raise an exception
+    patched_yf.history.side_effect = Exception("API Error")
     
     # Should return empty DataFrame on error
     df = analyzer.get_stock_data('INVALID')
     assert isinstance(df, pd.DataFrame)
     assert df.empty
 
-def test_invalid_stock_correlation(mocker):
+def test_invalid_stock_correlation(patched_download):
     """Test correlation analysis with invalid stock symbols."""
     analyzer = StockDataAnalyzer()
     
-    # Mock yfinance to return empty data
-    mock_ticker = mocker.Mock()
-    mock_ticker.history.return_value = pd.DataFrame()
-    mocker.patch('yfinance.Ticker', return_value=mock_ticker)
+    # Make yfinance return empty data
+    patched_download.return_value = pd.DataFrame()
     
     correlation = analyzer.analyze_correlation('INVALID1', 'INVALID2')
-    assert correlation == 0.0  # Should return 0 correlation for invalid stocks
\ No newline at end of file
+    assert correlation == 0.0  # Should return 0 correlation for invalid stocks
+
+def test_get_stock_data_disk_cache(patched_yf):
+    """Test repeated fetches are served from the disk cache."""
+    analyzer = StockDataAnalyzer()
+    patched_yf.history.return_value = _CANONICAL_DF.tz_localize('America/New_York')  # Mutated below
+    
+    first = analyzer.get_stock_data('AAPL', period='5d')
+    first['Close'] = 0.0
+    second = analyzer.get_stock_data('AAPL', period='5d')
+    
+    assert patched_yf.history.call_count == 1
+    assert second['Close'].tolist() == _CANONICAL_DF['Close'].tolist()
+
+def test_get_multi_stock_data_uses_shared_cache(patched_yf, patched_download):
+    """Test symbols cached by get_stock_data are not downloaded again."""
+    analyzer = StockDataAnalyzer()
+    analyzer.get_stock_data('AAPL')
+    
+    data = analyzer.get_multi_stock_data(('AAPL', 'MSFT'))
+    
+    patched_download.assert_called_once()
+    assert patched_download.call_args.args[0] == ['MSFT']
+    assert data['AAPL']['Close'].tolist() == _CANONICAL_DF['Close'].tolist()
+    assert data['MSFT']['Close'].tolist() == _CANONICAL_DF['Close'].tolist()[::-1]
+
+def test_correlation_after_single_fetch(patched_yf, patched_download):
+    """Test histories from Ticker.history and yf.download align when mixed."""
+    analyzer = StockDataAnalyzer()
+    analyzer.get_stock_data('AAPL')  # Cached from the tz-aware source
+    
+    correlation = analyzer.analyze_correlation('AAPL', 'MSFT')
+    
+    assert patched_download.call_args.args[0] == ['MSFT']
+    expected = _CANONICAL_DF['Close'].corr(_CANONICAL_MULTI_DF['MSFT']['Close'])
+    assert correlation == pytest.approx(expected)
+    assert correlation != 0.0
+
+def test_get_multi_stock_data_lowercase_symbols(patched_download):
+    """Test lowercase symbols match yfinance's uppercased tickers."""
+    analyzer = StockDataAnalyzer()
+    
+    data = analyzer.get_multi_stock_data(('aapl', 'msft'))
+    
+    assert data['aapl']['Close'].tolist() == _CANONICAL_DF['Close'].tolist()
+    assert not data['msft'].empty
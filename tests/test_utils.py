@@ -1,6 +1,7 @@
 # tests/test_utils.py
 import pytest
-from src.utils import TextPreprocessor, DataProcessor, CacheManager
+import pandas as pd
+from src.utils import TextPreprocessor, DataProcessor, CacheManager, DataValidator
 
 def test_text_preprocessing():
     """Test text preprocessing functions."""
@@ -15,6 +16,31 @@ def test_text_preprocessing():
     tickers = TextPreprocessor.extract_tickers(text)
     assert "AAPL" in tickers
 
+def test_clean_series_matches_clean_text():
+    """Test vectorized cleaning matches per-text cleaning."""
+    texts = pd.Series([
+        "Check out $AAPL and @wallstreetbets! http://example.com",
+        None,
+        "  Extra   spaces\tand\nlines  "
+    ])
+    
+    cleaned = TextPreprocessor.clean_series(texts)
+    assert cleaned.tolist() == [TextPreprocessor.clean_text(t) for t in texts.fillna('')]
+
+def test_series_extractors_match_per_text():
+    """Test vectorized mention/ticker extraction matches per-text extraction."""
+    texts = pd.Series([
+        "Check out $AAPL and @wallstreetbets! TSLA too",
+        "",
+        "nothing here @a @a"
+    ], dtype='string[pyarrow]')
+    
+    mentions = TextPreprocessor.extract_mentions_series(texts)
+    tickers = TextPreprocessor.extract_tickers_series(texts)
+    for text, found_mentions, found_tickers in zip(texts, mentions, tickers):
+        assert sorted(found_mentions) == sorted(TextPreprocessor.extract_mentions(text))
+        assert sorted(found_tickers) == sorted(TextPreprocessor.extract_tickers(text))
+
 def test_data_processing(sample_reddit_data):
     """Test data processing functions."""
     processed_df = DataProcessor.calculate_engagement_metrics(sample_reddit_data)
@@ -23,6 +49,17 @@ def test_data_processing(sample_reddit_data):
     assert 'hour_of_day' in processed_df.columns
     assert 'day_of_week' in processed_df.columns
 
+def test_validate_reddit_data_derived_frames(sample_reddit_data):
+    """Test frames derived from a valid frame are validated afresh."""
+    df = sample_reddit_data.copy()
+    assert DataValidator.validate_reddit_data(df)
+    
+    nulled = df.copy()
+    nulled['title'] = None
+    assert not DataValidator.validate_reddit_data(nulled)
+    assert not DataValidator.validate_reddit_data(df.assign(score=['a'] * len(df)))
+    assert not DataValidator.validate_reddit_data(df.drop(columns=['title']))
+
 def test_cache_manager():
     """Test cache management."""
     cache = CacheManager(cache_duration=1)  # 1 second cache
@@ -35,3 +72,15 @@ def test_cache_manager():
     import time
     time.sleep(1.1)  # Wait for cache to expire
     assert cache.get('test_key') is None
+
+def test_cache_manager_evicts_least_recently_used():
+    """Test the cache drops the least recently used entry when full."""
+    cache = CacheManager(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' is now more recent than 'b'
+    
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3